@@ -1,11 +1,16 @@
 # backend/api/admin.py
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, select
+from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime, timedelta
-from database import get_db
+from database import get_db, get_async_db
 import models
 from core.dependencies import get_current_user
+from core.cache import cache_get, cache_set
+from core.config import ADMIN_CACHE_TTL, ADMIN_SCAN_BATCH_SIZE, ADMIN_STALE_TTL
 import pandas as pd
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
@@ -14,7 +19,7 @@ router = APIRouter(prefix="/api/admin", tags=["admin"])
 # ATHLETE MANAGEMENT
 # ============================================================================
 
-@router.get("/athletes")
+@router.get("/athletes", response_class=ORJSONResponse)
 async def get_athletes(
     search: str = Query(None),
     sport: str = Query(None),
@@ -23,55 +28,79 @@ async def get_athletes(
     max_score: float = Query(None, ge=0, le=100),
     page: int = Query(1, ge=1),
     limit: int = Query(20, le=100),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get paginated list of athletes with filtering"""
-    query = db.query(models.User).filter(
+    cache_key = f"admin:athletes:v1:{search}:{sport}:{location}:{min_score}:{max_score}:{page}:{limit}"
+    return await _cached_response(
+        cache_key,
+        lambda: _list_athletes(db, search, sport, location, min_score, max_score, page, limit)
+    )
+
+
+async def _cached_response(cache_key: str, build) -> ORJSONResponse:
+    """
+    Serve an admin report from Redis for ADMIN_CACHE_TTL seconds, otherwise
+    await build() for it. The last good result is kept for ADMIN_STALE_TTL
+    and served if the database is unavailable.
+    """
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return ORJSONResponse(cached)
+    
+    try:
+        result = await build()
+    except SQLAlchemyError:
+        stale = await cache_get(f"{cache_key}:stale")
+        if stale is None:
+            raise
+        return ORJSONResponse(stale)
+    
+    await cache_set(cache_key, result, ADMIN_CACHE_TTL)
+    await cache_set(f"{cache_key}:stale", result, ADMIN_STALE_TTL)
+    return ORJSONResponse(result)
+
+
+async def _list_athletes(db: AsyncSession, search, sport, location, min_score, max_score, page: int, limit: int) -> dict:
+    conditions = [
         models.User.role == 'athlete',
         models.User.is_active == True
-    )
+    ]
     
     if search:
         search_term = f"%{search}%"
-        query = query.filter(
+        conditions.append(
             func.lower(models.User.name).ilike(search_term) |
             func.lower(models.User.email).ilike(search_term) |
             func.lower(models.User.location).ilike(search_term)
         )
     
     if sport:
-        query = query.filter(models.User.sport == sport)
+        conditions.append(models.User.sport == sport)
     
     if location:
-        query = query.filter(models.User.location == location)
+        conditions.append(models.User.location == location)
     
     if min_score is not None:
-        query = query.filter(models.User.ai_score >= min_score)
+        conditions.append(models.User.ai_score >= min_score)
     
     if max_score is not None:
-        query = query.filter(models.User.ai_score <= max_score)
+        conditions.append(models.User.ai_score <= max_score)
     
-    total = query.count()
+    total = await db.scalar(select(func.count()).select_from(models.User).where(*conditions))
     offset = (page - 1) * limit
-    athletes = query.order_by(desc(models.User.ai_score)).offset(offset).limit(limit).all()
+    # Plain column rows, already shaped like the response items; no ORM instances
+    athletes = (await db.execute(
+        select(
+            models.User.id, models.User.name, models.User.email, models.User.sport,
+            models.User.location, models.User.age, models.User.ai_score, models.User.national_rank,
+            func.coalesce(func.nullif(models.User.profile_photo, ""), models.User.profile_image).label("profile_photo"),
+            models.User.is_verified, models.User.created_at
+        ).where(*conditions).order_by(desc(models.User.ai_score)).offset(offset).limit(limit)
+    )).mappings().all()
     
     return {
-        "data": [
-            {
-                "id": athlete.id,
-                "name": athlete.name,
-                "email": athlete.email,
-                "sport": athlete.sport,
-                "location": athlete.location,
-                "age": athlete.age,
-                "ai_score": athlete.ai_score,
-                "national_rank": athlete.national_rank,
-                "profile_photo": athlete.profile_photo or athlete.profile_image,
-                "is_verified": athlete.is_verified,
-                "created_at": athlete.created_at.isoformat()
-            }
-            for athlete in athletes
-        ],
+        "data": [dict(athlete) for athlete in athletes],
         "pagination": {
             "total": total,
             "page": page,
@@ -227,9 +256,13 @@ async def verify_assessment(
 # ANALYTICS
 # ============================================================================
 
-@router.get("/analytics/talent-map")
+@router.get("/analytics/talent-map", response_class=ORJSONResponse)
 async def get_talent_map(db: Session = Depends(get_db)):
     """Get talent distribution by region and sport"""
+    return await _cached_response("admin:talent-map:v1", lambda: _talent_map(db))
+
+
+async def _talent_map(db: Session) -> dict:
     # Regional distribution
     regional_query = db.query(
         models.User.location,
@@ -290,12 +323,16 @@ async def get_talent_map(db: Session = Depends(get_db)):
         ]
     }
 
-@router.get("/analytics/performance-trends")
+@router.get("/analytics/performance-trends", response_class=ORJSONResponse)
 async def get_performance_trends(
     days: int = Query(30, ge=1, le=365),
     db: Session = Depends(get_db)
 ):
     """Get performance trends over specified period"""
+    return await _cached_response(f"admin:performance-trends:v1:{days}", lambda: _performance_trends(db, days))
+
+
+async def _performance_trends(db: Session, days: int) -> dict:
     cutoff_date = datetime.utcnow() - timedelta(days=days)
     
     # Average scores over time
@@ -359,11 +396,15 @@ async def get_anomalies(
     # In a real implementation, this would use ML models to detect anomalies
     # For now, we'll simulate with some criteria
     
-    # Find assessments with scores that don't match expected patterns
-    anomalies = db.query(models.Assessment).filter(
-        models.Assessment.status == 'pending',
-        models.Assessment.ai_score.isnot(None)
-    ).order_by(desc(models.Assessment.created_at)).all()
+    # Find assessments with scores that don't match expected patterns.
+    # Every pending assessment is scanned, so stream them in batches
+    # (server-side cursor) instead of materializing the whole result.
+    anomalies = db.scalars(
+        select(models.Assessment).where(
+            models.Assessment.status == 'pending',
+            models.Assessment.ai_score.isnot(None)
+        ).order_by(desc(models.Assessment.created_at)).execution_options(yield_per=ADMIN_SCAN_BATCH_SIZE)
+    )
     
     # Apply anomaly detection logic (simplified)
     flagged_assessments = []
@@ -453,9 +494,13 @@ async def update_benchmarks(
         "benchmarks": benchmarks
     }
 
-@router.get("/usage-stats")
+@router.get("/usage-stats", response_class=ORJSONResponse)
 async def get_usage_stats(db: Session = Depends(get_db)):
     """Get system usage statistics"""
+    return await _cached_response("admin:usage-stats:v1", lambda: _usage_stats(db))
+
+
+async def _usage_stats(db: Session) -> dict:
     # Total users
     total_users = db.query(models.User).count()
     
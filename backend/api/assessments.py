@@ -1,23 +1,57 @@
 # backend/api/assessments.py
 
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, UploadFile, File, Form, HTTPException, Query
+from fastapi.responses import FileResponse, StreamingResponse, ORJSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select, update, cast, Numeric, tuple_
 from typing import Optional
 from core.dependencies import get_current_user, get_image_url
-from core.config import UPLOAD_DIR
-from database import get_db
-import models, crud
-from datetime import datetime
+from core.cache import cache_get, cache_set
+from core.config import (
+    UPLOAD_DIR, MAX_ASSESSMENT_VIDEO_SIZE, ASSESSMENT_RESULT_CACHE_TTL,
+    ASSESSMENT_INLINE_FALLBACK, UPLOAD_GC_MIN_AGE,
+)
+from core.jobs import enqueue_job
+from core.uploads import collect_unreferenced_uploads, save_upload_content_addressed
+from api.users import invalidate_user_cache
+from database import get_db, SessionLocal, AsyncSessionLocal
+import models, crud, schemas
 from pathlib import Path
-import random, shutil, traceback
+from datetime import datetime
+import asyncio
+import logging
+import random
+import orjson
 
 # Analyzers
-from ml_models.squat_counter_enhanced import EnhancedSquatCounter
+from ml_models import squat_counter_enhanced, vertical_jump_analyzer
+from ml_models.squat_counter_enhanced import analyze_squat_video
 from ml_models.shuttle_run.shuttle_run_analyzer import ShuttleRunAnalyzer
+from ml_models.shuttle_run import shuttle_run_model_utils
 from ml_models.vertical_jump_analyzer import VerticalJumpAnalyzer
 
 router = APIRouter(prefix="/api/assessments", tags=["assessments"])
+logger = logging.getLogger(__name__)
+
+# Feedback text is built once at import; the upload handler only fills in numbers
+FEEDBACK_TEMPLATES = {
+    "squats": (
+        "✅ Squat Analysis:\n\n"
+        "• Valid Reps: {valid}\n"
+        "• Partial Reps: {partial}\n"
+        "• Consistency: {consistency:.1f}%\n"
+        "• Avg Rep Time: {avg_rep_time:.2f}s\n\n"
+        "🏅 AI Score: {ai_score:.0f}%"
+    ),
+    "height_detection": (
+        "📏 Height Detection:\n\n"
+        "• Estimated height: {detected:.1f} cm\n"
+        "• Confidence: {ai_score:.1f}%\n\n"
+        "✔️ Recorded successfully!"
+    ),
+    "shuttle_run_failed": "🚫 Shuttle-run analysis failed: {error}",
+    "vertical_jump_failed": "🚫 Vertical-jump analysis failed: {error}",
+}
 
 
 # ============================================================================
@@ -65,6 +99,16 @@ def calculate_average_of_all_scores(user_id: int, db: Session) -> Optional[float
     return None
 
 
+def get_user_score_and_rank(user_id: int, db: Session) -> tuple:
+    """
+    Current (ai_score, national_rank) read from the database;
+    the authenticated user may come from the auth cache and lag behind.
+    """
+    return db.query(models.User.ai_score, models.User.national_rank).filter(
+        models.User.id == user_id
+    ).one()
+
+
 def update_user_national_rank(user_id: int, ai_score: float, db: Session) -> Optional[int]:
     """
     Calculate and update user's national rank based on their AI score.
@@ -82,10 +126,9 @@ def update_user_national_rank(user_id: int, ai_score: float, db: Session) -> Opt
     
     rank = higher_count + 1
     
-    user = db.query(models.User).filter(models.User.id == user_id).first()
-    if user:
-        user.national_rank = rank
-        db.commit()
+    db.execute(
+        update(models.User).where(models.User.id == user_id).values(national_rank=rank)
+    )
     
     return rank
 
@@ -93,35 +136,257 @@ def update_user_national_rank(user_id: int, ai_score: float, db: Session) -> Opt
 def recalculate_user_scores(user_id: int, db: Session) -> tuple:
     """
     Recalculate user's AI score (best average) and national rank.
+    The score is computed and written by a single UPDATE ... RETURNING, so it
+    joins whatever transaction the caller has open (e.g. a pending Assessment
+    insert) and everything is committed together.
     Returns: (new_ai_score, new_rank)
     """
-    # Calculate average of best scores per type
-    new_ai_score = calculate_average_of_best_scores(user_id, db)
+    best_per_type = select(
+        func.max(models.Assessment.ai_score).label('best_score')
+    ).where(
+        models.Assessment.user_id == user_id,
+        models.Assessment.ai_score.isnot(None),
+        models.Assessment.ai_score > 0
+    ).group_by(models.Assessment.test_type).subquery()
     
-    # Update user's AI score
-    user = db.query(models.User).filter(models.User.id == user_id).first()
-    if user:
-        user.ai_score = new_ai_score
-        db.commit()
+    new_ai_score = db.execute(
+        update(models.User)
+        .where(models.User.id == user_id)
+        .values(ai_score=select(
+            func.round(cast(func.avg(best_per_type.c.best_score), Numeric), 1)
+        ).scalar_subquery())
+        .returning(models.User.ai_score)
+    ).scalar()
     
     # Calculate and update rank
     new_rank = update_user_national_rank(user_id, new_ai_score, db) if new_ai_score else None
     
+    db.commit()
+    
     return new_ai_score, new_rank
 
 
+def collect_orphaned_videos() -> int:
+    """
+    Remove assessment videos no assessment points at any more (blocking).
+    Run periodically by the worker; returns the number of files deleted.
+    """
+    db = SessionLocal()
+    try:
+        referenced = set(db.scalars(select(models.Assessment.video_url).distinct()))
+    finally:
+        db.close()
+    return collect_unreferenced_uploads(
+        UPLOAD_DIR / "assessments", "/uploads/assessments/", referenced, UPLOAD_GC_MIN_AGE
+    )
+
+
+def _result_cache_key(user_id: int, assessment_id: int) -> str:
+    return f"assessment:result:{user_id}:{assessment_id}"
+
+
+def warm_analyzers() -> None:
+    """
+    Load models, benchmarks and MediaPipe graphs up front (blocking), so the
+    first analysis in a worker doesn't pay the initialization cost.
+    """
+    squat_counter_enhanced.warm_up()
+    vertical_jump_analyzer.warm_up()
+    shuttle_run_model_utils.get_feature_names()  # loads the Keras model, scaler and encoder
+
+
+def analyze_squats(file_path: Path) -> tuple:
+    # The squat counter prints per-frame progress in debug mode; only when DEBUG logging is on
+    result = analyze_squat_video(str(file_path), debug=logger.isEnabledFor(logging.DEBUG))
+    valid, partial = result.get("count", 0), result.get("partial_squats", 0)
+    if valid == 0:
+        ai_score = 15 * (partial / (partial + 1))
+    else:
+        base = 50
+        ai_score = base + min(40, valid * 2.5) + (result.get("consistency_score", 0) / 100) * 10
+    ai_score = max(0, min(100, ai_score))
+    feedback = FEEDBACK_TEMPLATES["squats"].format(
+        valid=valid,
+        partial=partial,
+        consistency=result.get("consistency_score", 0),
+        avg_rep_time=result.get("average_rep_time", 0),
+        ai_score=ai_score,
+    )
+    return ai_score, feedback, result
+
+
+def analyze_shuttle_run(file_path: Path) -> tuple:
+    result = ShuttleRunAnalyzer().analyze_video(str(file_path))
+    if result.get("success"):
+        return result["ai_score"], result["feedback"], result
+    return 0, FEEDBACK_TEMPLATES["shuttle_run_failed"].format(error=result.get("error")), {}
+
+
+def analyze_vertical_jump(file_path: Path) -> tuple:
+    result = VerticalJumpAnalyzer().analyze_video(str(file_path))
+    if result.get("success"):
+        return result["ai_score"], result["feedback"], result
+    return 0, FEEDBACK_TEMPLATES["vertical_jump_failed"].format(error=result.get("error")), {}
+
+
+def analyze_height(file_path: Path) -> tuple:
+    detected = 160 + random.random() * 40
+    ai_score = 95 + random.random() * 5
+    return ai_score, FEEDBACK_TEMPLATES["height_detection"].format(detected=detected, ai_score=ai_score), {}
+
+
+# One analyzer per test type; each returns (ai_score, feedback, analysis_result)
+ANALYZERS = {
+    schemas.TestType.SQUATS: analyze_squats,
+    schemas.TestType.SHUTTLE_RUN: analyze_shuttle_run,
+    schemas.TestType.VERTICAL_JUMP: analyze_vertical_jump,
+    schemas.TestType.HEIGHT_DETECTION: analyze_height,
+}
+
+
+def analyze_video(test_type: str, file_path: Path) -> tuple:
+    """
+    Run the analyzer for test_type over a saved video (CPU-bound, blocking).
+    Returns: (ai_score, feedback, analysis_result)
+    """
+    try:
+        analyzer = ANALYZERS[schemas.TestType(test_type)]
+    except ValueError:
+        # Rows created before test_type was validated on upload
+        return 0, "Analysis pending.", {}
+    return analyzer(file_path)
+
+
+def _load_pending_assessment(assessment_id: int) -> Optional[tuple]:
+    """(user_id, user_email, test_type, file_path) of a pending assessment, else None"""
+    db = SessionLocal()
+    try:
+        assessment = db.get(models.Assessment, assessment_id)
+        if assessment is None or assessment.status != "pending":
+            return None
+        file_path = UPLOAD_DIR / assessment.video_url.removeprefix("/uploads/")
+        return assessment.user_id, assessment.user.email, assessment.test_type, file_path
+    finally:
+        db.close()
+
+
+def _record_assessment_result(assessment_id: int, user_id: int, test_type: str,
+                              ai_score, feedback: str, analysis_result: dict) -> dict:
+    """Store a finished analysis, refresh the user's score and rank; returns the status payload"""
+    db = SessionLocal()
+    try:
+        assessment = db.get(models.Assessment, assessment_id)
+        assessment.ai_score = float(ai_score)
+        assessment.ai_feedback = feedback
+        assessment.status = "completed"
+        db.flush()
+
+        # ================================================================
+        # RECALCULATE USER'S AI SCORE AS AVERAGE OF BEST SCORES PER TYPE
+        # (same transaction as the update; committed inside)
+        # ================================================================
+        new_ai_score, new_rank = recalculate_user_scores(user_id, db)
+
+        # Get total athletes for context
+        total_athletes = db.query(models.User).filter(
+            models.User.role == 'athlete',
+            models.User.is_active == True,
+            models.User.ai_score.isnot(None),
+            models.User.ai_score > 0
+        ).count()
+    finally:
+        db.close()
+
+    # Calculate percentile
+    percentile = None
+    if new_rank and total_athletes > 0:
+        percentile = round(((total_athletes - new_rank) / total_athletes) * 100, 1)
+
+    return {
+        "id": assessment_id,
+        "test_type": test_type,
+        "ai_score": float(ai_score),  # This assessment's score
+        "feedback": feedback,
+        "details": analysis_result,
+        "status": "completed",
+        "user_stats": {
+            "ai_score": new_ai_score,  # Average of BEST scores (for Home page)
+            "this_assessment_score": float(ai_score),  # This specific assessment
+            "national_rank": new_rank,
+            "total_athletes": total_athletes,
+            "percentile": percentile
+        }
+    }
+
+
+def _mark_assessment_failed(assessment_id: int, feedback: str) -> None:
+    """Flag the assessment failed in its own transaction"""
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(models.Assessment)
+            .where(models.Assessment.id == assessment_id)
+            .values(status="failed", ai_feedback=feedback)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+async def process_assessment(assessment_id: int) -> None:
+    """
+    Analyze a pending assessment and record the result.
+    Runs in the arq worker (worker.py), or in-process as a background task
+    when the job queue is unavailable. The analysis and all database work run
+    in threads so they never block the event loop. Any error after the row is
+    loaded marks the assessment failed, so status polling always ends.
+    """
+    pending = await asyncio.to_thread(_load_pending_assessment, assessment_id)
+    if pending is None:
+        return
+    user_id, user_email, test_type, file_path = pending
+    
+    try:
+        ai_score, feedback, analysis_result = await asyncio.to_thread(analyze_video, test_type, file_path)
+        result = await asyncio.to_thread(
+            _record_assessment_result, assessment_id, user_id, test_type, ai_score, feedback, analysis_result
+        )
+    except Exception:
+        logger.exception("Assessment processing failed (id=%s, test_type=%s)", assessment_id, test_type)
+        result = {
+            "id": assessment_id,
+            "test_type": test_type,
+            "status": "failed",
+            "feedback": "Assessment processing failed",
+        }
+        try:
+            await asyncio.to_thread(_mark_assessment_failed, assessment_id, result["feedback"])
+        except Exception:
+            # The cached result below still ends the client's polling
+            logger.exception("Could not mark assessment %s failed", assessment_id)
+
+    await invalidate_user_cache(user_id, user_email)
+    await cache_set(_result_cache_key(user_id, assessment_id), result, ASSESSMENT_RESULT_CACHE_TTL)
+
+
 # ============================================================================
 # ENDPOINTS
 # ============================================================================
 
-@router.post("/upload")
+@router.post("/upload", status_code=202)
 async def upload_assessment(
+    background_tasks: BackgroundTasks,
     video: UploadFile = File(...),
-    test_type: str = Form(...),
+    test_type: schemas.TestType = Form(...),
     score: Optional[float] = Form(None),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
+    """
+    Save the video and queue it for analysis; returns 202 with the assessment id.
+    Poll GET /api/assessments/{id}/status for the result.
+    Answers 503 when the job queue is down, unless ASSESSMENT_INLINE_FALLBACK is set.
+    """
     try:
         # Validation
         allowed_types = {
@@ -134,169 +399,150 @@ async def upload_assessment(
         if video.content_type not in allowed_types:
             raise HTTPException(status_code=400, detail="Unsupported file type.")
 
-        max_size = 100 * 1024 * 1024  # 100 MB
-        video.file.seek(0, 2)
-        if video.file.tell() > max_size:
-            raise HTTPException(status_code=400, detail="File too large (>100 MB)")
-        video.file.seek(0)
-
-        # Save upload
-        dst_dir = UPLOAD_DIR / "assessments"
-        dst_dir.mkdir(parents=True, exist_ok=True)
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_name = "".join(c for c in video.filename if c.isalnum() or c in "._-") or "video.mp4"
-        file_path = dst_dir / f"{ts}_{test_type}_{safe_name}"
-        with open(file_path, "wb") as f:
-            shutil.copyfileobj(video.file, f)
-
-        # Analyze based on test type
-        ai_score, feedback, analysis_result = 0, "Analysis pending.", {}
-
-        if test_type == "squats":
-            counter = EnhancedSquatCounter()
-            result = counter.analyze_video(str(file_path))
-            valid, partial = result.get("count", 0), result.get("partial_squats", 0)
-            if valid == 0:
-                ai_score = 15 * (partial / (partial + 1))
-            else:
-                base = 50
-                ai_score = base + min(40, valid * 2.5) + (result.get("consistency_score", 0) / 100) * 10
-            ai_score = max(0, min(100, ai_score))
-            feedback = (
-                f"✅ Squat Analysis:\n\n"
-                f"• Valid Reps: {valid}\n"
-                f"• Partial Reps: {partial}\n"
-                f"• Consistency: {result.get('consistency_score', 0):.1f}%\n"
-                f"• Avg Rep Time: {result.get('average_rep_time', 0):.2f}s\n\n"
-                f"🏅 AI Score: {ai_score:.0f}%"
-            )
-            analysis_result = result
-
-        elif test_type == "shuttle_run":
-            shuttle = ShuttleRunAnalyzer()
-            result = shuttle.analyze_video(str(file_path))
-            if result.get("success"):
-                ai_score = result["ai_score"]
-                feedback = result["feedback"]
-                analysis_result = result
-            else:
-                feedback = f"🚫 Shuttle-run analysis failed: {result.get('error')}"
-                ai_score = 0
-
-        elif test_type == "vertical_jump":
-            vja = VerticalJumpAnalyzer()
-            result = vja.analyze_video(str(file_path))
-            if result.get("success"):
-                ai_score = result["ai_score"]
-                feedback = result["feedback"]
-                analysis_result = result
-            else:
-                feedback = f"🚫 Vertical-jump analysis failed: {result.get('error')}"
-                ai_score = 0
-
-        elif test_type == "height_detection":
-            detected = 160 + random.random() * 40
-            ai_score = 95 + random.random() * 5
-            feedback = (
-                f"📏 Height Detection:\n\n"
-                f"• Estimated height: {detected:.1f} cm\n"
-                f"• Confidence: {ai_score:.1f}%\n\n"
-                f"✔️ Recorded successfully!"
-            )
-
-        # Save assessment to database
+        # Save upload (size is enforced while copying); the file is named by
+        # content hash, so re-submitting the same video reuses the stored copy
+        extension = Path(video.filename or "").suffix.lstrip(".") or "mp4"
+        stored = await save_upload_content_addressed(
+            video, UPLOAD_DIR / "assessments", extension, MAX_ASSESSMENT_VIDEO_SIZE
+        )
+
+        # Record the assessment as pending; the worker fills in the score
         assessment = models.Assessment(
             user_id=current_user.id,
-            test_type=test_type,
-            video_url=f"/uploads/assessments/{file_path.name}",
+            test_type=test_type.value,
+            video_url=f"/uploads/assessments/{stored}",
             score=score,
-            ai_score=float(ai_score),
-            ai_feedback=feedback,
-            status="completed",
+            ai_feedback="Analysis pending.",
+            status="pending",
         )
         db.add(assessment)
         db.commit()
-        db.refresh(assessment)
+        assessment_id = assessment.id
 
-        # ================================================================
-        # RECALCULATE USER'S AI SCORE AS AVERAGE OF BEST SCORES PER TYPE
-        # ================================================================
-        new_ai_score, new_rank = recalculate_user_scores(current_user.id, db)
+    except HTTPException:
+        raise
+    except Exception:
+        # The stored video is left in place: it may be shared with another
+        # assessment, and a retry of the same upload will reuse it
+        logger.exception("Assessment upload failed (test_type=%s)", test_type.value)
+        raise HTTPException(status_code=500, detail="Assessment processing failed")
 
-        # Get total athletes for context
-        total_athletes = db.query(models.User).filter(
-            models.User.role == 'athlete',
-            models.User.is_active == True,
-            models.User.ai_score.isnot(None),
-            models.User.ai_score > 0
-        ).count()
+    job_id = await enqueue_job("process_assessment", assessment_id)
+    if job_id is None:
+        if ASSESSMENT_INLINE_FALLBACK:
+            # No job queue: analyze in this process once the response is sent
+            background_tasks.add_task(process_assessment, assessment_id)
+        else:
+            # Never run the analysis on a web worker; the video is left for the GC
+            db.query(models.Assessment).filter(models.Assessment.id == assessment_id).delete()
+            db.commit()
+            raise HTTPException(status_code=503, detail="Assessment analysis is temporarily unavailable")
 
-        # Calculate percentile
-        percentile = None
-        if new_rank and total_athletes > 0:
-            percentile = round(((total_athletes - new_rank) / total_athletes) * 100, 1)
+    return {"id": assessment_id, "test_type": test_type.value, "status": "pending", "job_id": job_id}
 
-        return {
-            "id": assessment.id,
-            "test_type": test_type,
-            "ai_score": float(ai_score),  # This assessment's score
-            "feedback": feedback,
-            "details": analysis_result,
-            "status": "completed",
-            "user_stats": {
-                "ai_score": new_ai_score,  # Average of BEST scores (for Home page)
-                "this_assessment_score": float(ai_score),  # This specific assessment
-                "national_rank": new_rank,
-                "total_athletes": total_athletes,
-                "percentile": percentile
-            }
-        }
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        traceback.print_exc()
-        if "file_path" in locals() and Path(file_path).exists():
-            try:
-                Path(file_path).unlink()
-            except Exception:
-                pass
-        raise HTTPException(status_code=500, detail="Assessment processing failed")
+@router.get("/{assessment_id}/status", response_class=ORJSONResponse)
+async def get_assessment_status(
+    assessment_id: int,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Poll a queued assessment. Read from the database while it is pending and,
+    once finished, answered from the cache with the full result (score, feedback,
+    updated user stats). Only finished results are cached, so a lost job can't
+    leave a stale "pending" behind.
+    """
+    cached = await cache_get(_result_cache_key(current_user.id, assessment_id))
+    if cached is not None and cached.get("status") != "pending":
+        return ORJSONResponse(cached)
+    
+    assessment = db.query(
+        models.Assessment.id,
+        models.Assessment.test_type,
+        models.Assessment.status,
+        models.Assessment.ai_score,
+        models.Assessment.ai_feedback,
+    ).filter(
+        models.Assessment.id == assessment_id,
+        models.Assessment.user_id == current_user.id
+    ).first()
+    
+    if not assessment:
+        raise HTTPException(status_code=404, detail="Assessment not found")
+    
+    return ORJSONResponse({
+        "id": assessment.id,
+        "test_type": assessment.test_type,
+        "status": assessment.status,
+        "ai_score": assessment.ai_score,
+        "feedback": assessment.ai_feedback,
+    })
 
 
 @router.get("")
 async def get_assessments(
     test_type: Optional[str] = None,
     limit: int = Query(20, le=100),
+    before_created_at: Optional[datetime] = None,
+    before_id: Optional[int] = None,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db),
 ):
-    """Get user's assessments with optional filter by test type"""
-    q = db.query(models.Assessment).filter(models.Assessment.user_id == current_user.id)
+    """
+    Get user's assessments with optional filter by test type.
+    Rows are encoded with orjson and streamed as the cursor yields them,
+    so the full list is never materialized in memory.
+    Paginate with the (before_created_at, before_id) keyset from next_cursor.
+    """
+    stmt = select(
+        models.Assessment.id,
+        models.Assessment.test_type,
+        models.Assessment.score,
+        models.Assessment.ai_score,
+        models.Assessment.ai_feedback,
+        models.Assessment.status,
+        models.Assessment.video_url,
+        models.Assessment.created_at,
+    ).where(models.Assessment.user_id == current_user.id)
     if test_type:
-        q = q.filter(models.Assessment.test_type == test_type)
-    rows = q.order_by(models.Assessment.created_at.desc()).limit(limit).all()
+        stmt = stmt.where(models.Assessment.test_type == test_type)
+    if before_created_at is not None and before_id is not None:
+        stmt = stmt.where(
+            tuple_(models.Assessment.created_at, models.Assessment.id) < (before_created_at, before_id)
+        )
+    stmt = stmt.order_by(models.Assessment.created_at.desc(), models.Assessment.id.desc()).limit(limit)
+    
+    tail = {}
+    
+    async def stream_assessments():
+        # The request-scoped session is closed before the body is sent,
+        # so the generator owns its own (async) session for the lifetime of the cursor.
+        yield b'{"data":['
+        count, last = 0, None
+        async with AsyncSessionLocal() as session:
+            result = await session.stream(stmt.execution_options(yield_per=100))
+            async for row in result.mappings():
+                if count:
+                    yield b','
+                yield orjson.dumps(dict(row))
+                count, last = count + 1, row
+            # Score and rank are read fresh; the authenticated user may be a cached copy
+            user = (await session.execute(
+                select(models.User.ai_score, models.User.national_rank)
+                .where(models.User.id == current_user.id)
+            )).one()
+        tail["current_ai_score"] = user.ai_score  # This is now average of BEST
+        tail["national_rank"] = user.national_rank
+        tail["next_cursor"] = (
+            {"before_created_at": last["created_at"], "before_id": last["id"]}
+            if count == limit else None
+        )
+        yield b'],' + orjson.dumps(tail)[1:]
     
-    return {
-        "data": [
-            {
-                "id": a.id,
-                "test_type": a.test_type,
-                "score": a.score,
-                "ai_score": a.ai_score,
-                "ai_feedback": a.ai_feedback,
-                "status": a.status,
-                "video_url": a.video_url,
-                "created_at": a.created_at.isoformat(),
-            }
-            for a in rows
-        ],
-        "current_ai_score": current_user.ai_score,  # This is now average of BEST
-        "national_rank": current_user.national_rank
-    }
+    return StreamingResponse(stream_assessments(), media_type="application/json")
 
 
-@router.get("/stats")
+@router.get("/stats", response_class=ORJSONResponse)
 async def get_assessment_stats(
     current_user: models.User = Depends(get_current_user), 
     db: Session = Depends(get_db)
@@ -306,10 +552,12 @@ async def get_assessment_stats(
     Returns BOTH average of all scores AND average of best scores.
     """
     
-    # Get stats grouped by test type
-    stats = (
+    # Per-type stats plus the grand total row in one ROLLUP query
+    is_total = func.grouping(models.Assessment.test_type).label("is_total")
+    rows = (
         db.query(
             models.Assessment.test_type,
+            is_total,
             func.count(models.Assessment.id).label("count"),
             func.avg(models.Assessment.ai_score).label("avg_score"),
             func.max(models.Assessment.ai_score).label("best_score"),
@@ -319,17 +567,20 @@ async def get_assessment_stats(
             models.Assessment.ai_score.isnot(None),
             models.Assessment.ai_score > 0
         )
-        .group_by(models.Assessment.test_type)
+        .group_by(func.rollup(models.Assessment.test_type))
         .all()
     )
+    stats = [r for r in rows if not r.is_total]
+    totals = next((r for r in rows if r.is_total), None)
 
-    total = sum(s.count for s in stats)
+    total = totals.count if totals else 0
     
-    # Calculate average of ALL scores (for Assessment page display)
-    all_scores_avg = calculate_average_of_all_scores(current_user.id, db)
+    # Average of ALL scores (for Assessment page display)
+    all_scores_avg = round(float(totals.avg_score), 1) if totals and totals.avg_score else None
     
-    # Calculate average of BEST scores per type (for Home page / Ranking)
-    best_scores_avg = calculate_average_of_best_scores(current_user.id, db)
+    # Average of BEST scores per type (for Home page / Ranking)
+    best_scores = [s.best_score for s in stats if s.best_score]
+    best_scores_avg = round(sum(best_scores) / len(best_scores), 1) if best_scores else None
     
     # Get latest assessment
     latest = db.query(models.Assessment).filter(
@@ -346,25 +597,27 @@ async def get_assessment_stats(
         models.User.ai_score > 0
     ).count()
 
+    _, national_rank = get_user_score_and_rank(current_user.id, db)
+
     # Calculate percentile (based on best scores average)
     percentile = None
-    if current_user.national_rank and total_athletes > 0:
-        percentile = round(((total_athletes - current_user.national_rank) / total_athletes) * 100, 1)
+    if national_rank and total_athletes > 0:
+        percentile = round(((total_athletes - national_rank) / total_athletes) * 100, 1)
 
-    return {
+    return ORJSONResponse({
         "total_assessments": total,
         # For Assessment page display - average of ALL scores
         "average_score": all_scores_avg,
         # For Home page / Rankings - average of BEST per type
         "current_ai_score": best_scores_avg,
-        "national_rank": current_user.national_rank,
+        "national_rank": national_rank,
         "total_athletes": total_athletes,
         "percentile": percentile,
         "latest_assessment": {
             "id": latest.id,
             "test_type": latest.test_type,
             "ai_score": latest.ai_score,
-            "created_at": latest.created_at.isoformat()
+            "created_at": latest.created_at
         } if latest else None,
         "by_test_type": {
             s.test_type: {
@@ -378,7 +631,7 @@ async def get_assessment_stats(
             "average_score": "Average of all assessment scores (shown on Assessment page)",
             "current_ai_score": "Average of best scores per type (used for ranking & Home page)"
         }
-    }
+    })
 
 
 @router.get("/latest")
@@ -405,9 +658,11 @@ async def get_latest_assessment(
         models.User.ai_score > 0
     ).count()
 
+    ai_score, national_rank = get_user_score_and_rank(current_user.id, db)
+
     percentile = None
-    if current_user.national_rank and total_athletes > 0:
-        percentile = round(((total_athletes - current_user.national_rank) / total_athletes) * 100, 1)
+    if national_rank and total_athletes > 0:
+        percentile = round(((total_athletes - national_rank) / total_athletes) * 100, 1)
 
     return {
         "assessment": {
@@ -420,8 +675,8 @@ async def get_latest_assessment(
             "created_at": latest.created_at.isoformat()
         },
         "user_stats": {
-            "ai_score": current_user.ai_score,  # Average of BEST
-            "national_rank": current_user.national_rank,
+            "ai_score": ai_score,  # Average of BEST
+            "national_rank": national_rank,
             "total_athletes": total_athletes,
             "percentile": percentile
         }
@@ -456,6 +711,33 @@ async def get_assessment_by_id(
     }
 
 
+@router.get("/{assessment_id}/video")
+async def get_assessment_video(
+    assessment_id: int,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream the assessment video back to its owner.
+    FileResponse reads the file in chunks off the event loop and sends them
+    as is (video/* responses are exempt from the GZip middleware in main.py);
+    serving without Python in the path needs a front server, see /uploads in main.py.
+    """
+    video_url = db.query(models.Assessment.video_url).filter(
+        models.Assessment.id == assessment_id,
+        models.Assessment.user_id == current_user.id
+    ).scalar()
+    
+    if not video_url:
+        raise HTTPException(status_code=404, detail="Assessment video not found")
+    
+    video_path = UPLOAD_DIR / video_url.removeprefix("/uploads/")
+    if not video_path.is_file():
+        raise HTTPException(status_code=404, detail="Assessment video not found")
+    
+    return FileResponse(video_path, filename=video_path.name)
+
+
 @router.delete("/{assessment_id}")
 async def delete_assessment(
     assessment_id: int,
@@ -472,20 +754,14 @@ async def delete_assessment(
     if not assessment:
         raise HTTPException(status_code=404, detail="Assessment not found")
     
-    # Delete the video file if exists
-    if assessment.video_url:
-        video_path = UPLOAD_DIR / assessment.video_url.lstrip("/uploads/")
-        if video_path.exists():
-            try:
-                video_path.unlink()
-            except Exception:
-                pass
-    
+    # The video file is content-addressed and may be shared with other (or
+    # concurrently uploaded) assessments; it is left to collect_orphaned_videos
     db.delete(assessment)
     db.commit()
     
     # Recalculate user's AI score after deletion
     new_ai_score, new_rank = recalculate_user_scores(current_user.id, db)
+    await invalidate_user_cache(current_user.id, current_user.email)
     
     return {
         "message": "Assessment deleted successfully",
@@ -519,6 +795,7 @@ async def get_assessment_history(
     assessments = query.order_by(
         models.Assessment.created_at.desc()
     ).offset(offset).limit(limit).all()
+    ai_score, national_rank = get_user_score_and_rank(current_user.id, db)
     
     return {
         "data": [
@@ -540,8 +817,8 @@ async def get_assessment_history(
             "has_more": offset + limit < total
         },
         "current_stats": {
-            "ai_score": current_user.ai_score,
-            "national_rank": current_user.national_rank
+            "ai_score": ai_score,
+            "national_rank": national_rank
         }
     }
 
@@ -554,6 +831,7 @@ async def recalculate_my_rank(
     """Recalculate current user's AI score and national rank"""
     
     new_ai_score, new_rank = recalculate_user_scores(current_user.id, db)
+    await invalidate_user_cache(current_user.id, current_user.email)
     
     if not new_ai_score:
         return {
@@ -648,8 +926,8 @@ async def get_user_assessment_stats(
         
     except HTTPException:
         raise
-    except Exception as e:
-        traceback.print_exc()
+    except Exception:
+        logger.exception("Failed to fetch assessment stats for user %s", user_id)
         raise HTTPException(status_code=500, detail="Failed to fetch user assessment stats")
 # backend/api/assessments.py - ADD THIS ENDPOINT
 
@@ -702,7 +980,7 @@ async def get_user_assessment_stats(
                 "best_score": round(float(stat.best_score), 1) if stat.best_score else 0
             }
         
-        print(f"Assessment stats for user {user_id}: {total_assessments} total, by_type: {by_test_type}")
+        logger.debug("Assessment stats for user %s: %s total, by_type: %s", user_id, total_assessments, by_test_type)
         
         return {
             "total_assessments": total_assessments,
@@ -721,5 +999,5 @@ async def get_user_assessment_stats(
     except HTTPException:
         raise
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("Failed to fetch assessment stats for user %s", user_id)
         raise HTTPException(status_code=500, detail=f"Failed to fetch user assessment stats: {str(e)}")    
\ No newline at end of file
@@ -11,8 +11,10 @@ from datetime import datetime, timedelta
 from database import get_db
 from core.dependencies import get_current_user, get_image_url
 import models
+import logging
 
 router = APIRouter(prefix="/api/coach", tags=["coach-assessments"])
+logger = logging.getLogger(__name__)
 
 
 # ============================================================================
@@ -223,8 +225,7 @@ async def get_coach_assessments(
         }
         
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("get_coach_assessments failed")
         raise HTTPException(status_code=500, detail=f"Failed to fetch assessments: {str(e)}")
 
 
@@ -1,18 +1,56 @@
 # backend/api/coaches.py
 from fastapi import APIRouter, Depends, HTTPException, Query, Form, File, UploadFile
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload, raiseload
 from typing import Optional, List
 from database import get_db
 from core.dependencies import get_current_user, get_image_url, get_image_url_with_fallback
 from core.config import UPLOAD_DIR
+from core.uploads import save_upload_content_addressed
+from api.users import invalidate_user_cache
 import models
-from sqlalchemy import or_ as db_or, and_ as db_and, func
-import traceback
-import shutil
+from sqlalchemy import or_ as db_or, and_ as db_and, func, select
 from datetime import datetime
 from pathlib import Path
+import logging
 
 router = APIRouter(prefix="/api/coach", tags=["coach"])
+logger = logging.getLogger(__name__)
+
+
+def _connection_statuses(db: Session, me_id: int, user_ids: List[int]) -> dict:
+    """{user_id: status} of my connection with each of user_ids, in one query"""
+    if not user_ids:
+        return {}
+    conn = models.connections.c
+    rows = db.query(conn.user_id, conn.connected_user_id, conn.status).filter(
+        db_or(
+            db_and(conn.user_id == me_id, conn.connected_user_id.in_(user_ids)),
+            db_and(conn.connected_user_id == me_id, conn.user_id.in_(user_ids))
+        )
+    ).all()
+    return {
+        (connected_user_id if user_id == me_id else user_id): status
+        for user_id, connected_user_id, status in rows
+    }
+
+
+def _latest_assessments(db: Session, user_ids: List[int], scored_only: bool = False) -> dict:
+    """
+    {user_id: row} with each user's most recent assessment (test_type, ai_score,
+    created_at) and their assessment count, in one query via window functions
+    """
+    if not user_ids:
+        return {}
+    a = models.Assessment
+    filters = [a.user_id.in_(user_ids)]
+    if scored_only:
+        filters.append(a.ai_score.isnot(None))
+    ranked = db.query(
+        a.user_id, a.test_type, a.ai_score, a.created_at,
+        func.row_number().over(partition_by=a.user_id, order_by=(a.created_at.desc(), a.id.desc())).label("rn"),
+        func.count().over(partition_by=a.user_id).label("total")
+    ).filter(*filters).subquery()
+    return {row.user_id: row for row in db.query(ranked).filter(ranked.c.rn == 1).all()}
 
 
 # ============================================================================
@@ -54,26 +92,15 @@ async def get_coach_athletes(
     offset = (page - 1) * limit
     athletes = query.offset(offset).limit(limit).all()
     
+    # Connection status and latest assessment for the whole page (no N+1)
+    athlete_ids = [athlete.id for athlete in athletes]
+    statuses = _connection_statuses(db, current_user.id, athlete_ids)
+    latest = _latest_assessments(db, athlete_ids)
+    
     formatted_athletes = []
     for athlete in athletes:
-        # Check connection status
-        connection = db.query(models.connections).filter(
-            db_or(
-                db_and(
-                    models.connections.c.user_id == current_user.id,
-                    models.connections.c.connected_user_id == athlete.id
-                ),
-                db_and(
-                    models.connections.c.user_id == athlete.id,
-                    models.connections.c.connected_user_id == current_user.id
-                )
-            )
-        ).first()
-        
-        # Get latest assessment
-        latest_assessment = db.query(models.Assessment).filter(
-            models.Assessment.user_id == athlete.id
-        ).order_by(models.Assessment.created_at.desc()).first()
+        connection_status = statuses.get(athlete.id)
+        latest_assessment = latest.get(athlete.id)
         
         formatted_athletes.append({
             "id": athlete.id,
@@ -92,8 +119,8 @@ async def get_coach_athletes(
             "age": athlete.age or 0,
             "ai_score": athlete.ai_score or 0,
             "national_rank": athlete.national_rank,
-            "is_connected": connection is not None and connection.status == 'accepted',
-            "connection_status": connection.status if connection else None,
+            "is_connected": connection_status == 'accepted',
+            "connection_status": connection_status,
             "latest_assessment": {
                 "test_type": latest_assessment.test_type,
                 "ai_score": latest_assessment.ai_score,
@@ -242,7 +269,8 @@ async def get_coach_dashboard_feed(
     posts = db.query(models.Post).filter(
         models.Post.user_id.in_(connected_athlete_ids)
     ).options(
-        joinedload(models.Post.user)
+        selectinload(models.Post.user).raiseload('*'),
+        raiseload('*')
     ).order_by(
         models.Post.created_at.desc()
     ).offset(offset).limit(limit).all()
@@ -453,7 +481,7 @@ async def get_coach_assessments(
         }
         
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("get_coach_assessments failed")
         raise HTTPException(status_code=500, detail=f"Failed to fetch assessments: {str(e)}")
 
 
@@ -625,7 +653,7 @@ async def get_coach_assessment_statistics(
         }
         
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("get_coach_assessment_statistics failed")
         raise HTTPException(status_code=500, detail="Failed to compute coach statistics")
 
 
@@ -643,13 +671,10 @@ async def get_coach_dashboard_stats(
         raise HTTPException(status_code=403, detail="Access denied. Coaches only.")
     
     # Connected athletes count
-    connected_athletes = db.query(models.connections).filter(
-        db_or(
-            models.connections.c.user_id == current_user.id,
-            models.connections.c.connected_user_id == current_user.id
-        ),
-        models.connections.c.status == 'accepted'
-    ).count()
+    # Read fresh: the trigger-maintained column changes under the cached auth copy of current_user
+    connected_athletes = db.scalar(
+        select(models.User.connection_count).where(models.User.id == current_user.id)
+    ) or 0
     
     # Get connected athlete IDs for assessment count
     connected_athlete_ids = db.query(models.User.id).join(
@@ -712,13 +737,10 @@ async def get_coach_profile(
         raise HTTPException(status_code=403, detail="Access denied. Coaches only.")
     
     # Get connected athletes count
-    connected_athletes = db.query(models.connections).filter(
-        db_or(
-            models.connections.c.user_id == current_user.id,
-            models.connections.c.connected_user_id == current_user.id
-        ),
-        models.connections.c.status == 'accepted'
-    ).count()
+    # Read fresh: the trigger-maintained column changes under the cached auth copy of current_user
+    connected_athletes = db.scalar(
+        select(models.User.connection_count).where(models.User.id == current_user.id)
+    ) or 0
     
     # Get connected athlete IDs
     connected_athlete_ids = db.query(models.User.id).join(
@@ -829,26 +851,17 @@ async def update_coach_profile(
             if extension == "jpeg":
                 extension = "jpg"
             
-            # Create filename
-            file_name = f"coach_profile_{current_user.id}_{datetime.now().timestamp()}.{extension}"
-            
-            # Ensure profiles directory exists
-            profiles_dir = Path(UPLOAD_DIR) / "profiles"
-            profiles_dir.mkdir(parents=True, exist_ok=True)
-            
-            file_path = profiles_dir / file_name
-            
-            # Save file
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(profileImage.file, buffer)
+            # Save file, named by content hash so identical images share one file
+            stored = await save_upload_content_addressed(profileImage, Path(UPLOAD_DIR) / "profiles", extension)
             
             # Update user record
-            image_url = f"/uploads/profiles/{file_name}"
+            image_url = f"/uploads/profiles/{stored}"
             current_user.profile_image = image_url
             current_user.profile_photo = image_url
         
         db.commit()
         db.refresh(current_user)
+        await invalidate_user_cache(current_user.id, current_user.email)
         
         return {
             "message": "Coach profile updated successfully",
@@ -878,7 +891,7 @@ async def update_coach_profile(
         
     except Exception as e:
         db.rollback()
-        traceback.print_exc()
+        logger.exception("update_coach_profile failed")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1002,38 +1015,17 @@ async def get_all_athletes(
         offset = (page - 1) * limit
         athletes = query.offset(offset).limit(limit).all()
         
+        # Connection status, latest scored assessment and count for the whole page (no N+1)
+        athlete_ids = [athlete.id for athlete in athletes]
+        statuses = _connection_statuses(db, current_user.id, athlete_ids)
+        latest = _latest_assessments(db, athlete_ids, scored_only=True)
+        
         # Format response with connection status
         formatted_athletes = []
         for athlete in athletes:
-            # Check if connected to this coach
-            connection = db.query(models.connections).filter(
-                db_or(
-                    db_and(
-                        models.connections.c.user_id == current_user.id,
-                        models.connections.c.connected_user_id == athlete.id
-                    ),
-                    db_and(
-                        models.connections.c.user_id == athlete.id,
-                        models.connections.c.connected_user_id == current_user.id
-                    )
-                )
-            ).first()
-            
-            connection_status = None
-            if connection:
-                connection_status = connection.status
-            
-            # Get latest assessment info
-            latest_assessment = db.query(models.Assessment).filter(
-                models.Assessment.user_id == athlete.id,
-                models.Assessment.ai_score.isnot(None)
-            ).order_by(models.Assessment.created_at.desc()).first()
-            
-            # Get assessment count
-            assessment_count = db.query(models.Assessment).filter(
-                models.Assessment.user_id == athlete.id,
-                models.Assessment.ai_score.isnot(None)
-            ).count()
+            connection_status = statuses.get(athlete.id)
+            latest_assessment = latest.get(athlete.id)
+            assessment_count = latest_assessment.total if latest_assessment else 0
             
             formatted_athletes.append({
                 "id": athlete.id,
@@ -1085,7 +1077,7 @@ async def get_all_athletes(
         }
         
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("get_all_athletes failed")
         raise HTTPException(status_code=500, detail=f"Failed to fetch athletes: {str(e)}")
 
 
@@ -1140,7 +1132,7 @@ async def get_top_athletes(
         }
         
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("get_top_athletes failed")
         raise HTTPException(status_code=500, detail="Failed to fetch top athletes")
 
 
@@ -1198,7 +1190,7 @@ async def get_active_athletes(
         }
         
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("get_active_athletes failed")
         raise HTTPException(status_code=500, detail="Failed to fetch active athletes")
 
 
@@ -1274,5 +1266,5 @@ async def get_rising_stars(
         }
         
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("get_rising_stars failed")
         raise HTTPException(status_code=500, detail="Failed to fetch rising stars")
\ No newline at end of file
@@ -1,38 +1,109 @@
 # backend/api/connections.py
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session, load_only
 from typing import Optional, List
 from core.dependencies import get_current_user, get_current_user_optional, get_image_url # Changed & added get_image_url
+from core.cache import cache_get, cache_set, cache_delete_pattern, acquire_guard
+from core.config import SUGGESTIONS_CACHE_TTL, AVAILABLE_COUNT_CACHE_TTL, CONNECTION_REQUEST_GUARD_TTL
 from database import get_db # Changed
-import models, schemas # Changed
-from sqlalchemy import or_ as db_or, and_ as db_and, func
-import traceback
+import models, schemas, crud # Changed
+from sqlalchemy import or_ as db_or, and_ as db_and, func, select, union_all, exists, lambda_stmt
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+import random
+import logging
 
 router = APIRouter(prefix="/api/connections", tags=["connections"])
+logger = logging.getLogger(__name__)
 
+SUGGESTION_SAMPLE_ATTEMPTS = 3
 
-@router.get("")
-async def get_connections(current_user: models.User = Depends(get_current_user), db: Session = Depends(get_db)):
-    try:
-        connections_initiated = db.query(models.User).join(
-            models.connections,
-            models.connections.c.connected_user_id == models.User.id
-        ).filter(
-            models.connections.c.user_id == current_user.id,
-            models.connections.c.status == 'accepted'
-        ).all()
 
-        connections_received = db.query(models.User).join(
-            models.connections,
-            models.connections.c.user_id == models.User.id
-        ).filter(
-            models.connections.c.connected_user_id == current_user.id,
-            models.connections.c.status == 'accepted'
-        ).all()
+def _suggestions_cache_key(user: models.User, limit: int) -> str:
+    return f"sugg:{user.id}:{user.sport}:{user.location}:{limit}"
 
-        all_connections = list({u.id: u for u in (connections_initiated + connections_received)}.values())
 
-        return {
+async def _invalidate_suggestions(*user_ids: int) -> None:
+    for uid in user_ids:
+        await cache_delete_pattern(f"sugg:{uid}:*")
+
+
+def _connected_to(me_id):
+    """
+    EXISTS a connections row (any status, either direction) between me and
+    the outer users row. Negated, it is an anti-join probing uq_connections_pair;
+    unlike NOT IN over a UNION it needs no dedup and is not voided by NULL ids.
+    """
+    conn = models.connections.c
+    return exists().where(
+        func.least(conn.user_id, conn.connected_user_id) == func.least(me_id, models.User.id),
+        func.greatest(conn.user_id, conn.connected_user_id) == func.greatest(me_id, models.User.id)
+    )
+
+
+def _available_criteria(stmt, me_id, role_filter, sport, location, search):
+    """
+    Append the /available filters to a lambda_stmt. Each branch is its own
+    lambda, so SQLAlchemy caches one compiled form per filter combination
+    and only the bound values change between requests.
+    """
+    if me_id is not None:
+        stmt += lambda s: s.where(
+            models.User.id != me_id,
+            ~_connected_to(me_id)
+        )
+    stmt += lambda s: s.where(models.User.is_active == True)
+    
+    if role_filter:
+        stmt += lambda s: s.where(models.User.role == role_filter)
+    
+    if sport:
+        sport_pattern = f'%{sport}%'
+        stmt += lambda s: s.where(models.User.sport.ilike(sport_pattern))
+    
+    if location:
+        location_pattern = f'%{location}%'
+        stmt += lambda s: s.where(models.User.location.ilike(location_pattern))
+    
+    if search:
+        search_pattern = f'%{search}%'
+        stmt += lambda s: s.where(
+            db_or(
+                models.User.name.ilike(search_pattern),
+                models.User.sport.ilike(search_pattern),
+                models.User.location.ilike(search_pattern),
+                models.User.bio.ilike(search_pattern)
+            )
+        )
+    return stmt
+
+
+@router.get("", response_class=ORJSONResponse)
+async def get_connections(current_user: models.User = Depends(get_current_user), db: Session = Depends(get_db)):
+    try:
+        conn = models.connections.c
+        # Accepted peers in either direction. uq_connections_pair allows one row
+        # per pair, so the halves are disjoint and UNION ALL skips the dedup sort
+        peer_ids = union_all(
+            select(conn.connected_user_id).where(
+                conn.user_id == current_user.id,
+                conn.status == 'accepted'
+            ),
+            select(conn.user_id).where(
+                conn.connected_user_id == current_user.id,
+                conn.status == 'accepted'
+            )
+        )
+        
+        # Only the serialized columns, as plain rows rather than ORM instances
+        all_connections = db.query(
+            models.User.id, models.User.name, models.User.profile_photo, models.User.profile_image,
+            models.User.role, models.User.sport, models.User.location,
+            models.User.is_online, models.User.last_seen
+        ).filter(models.User.id.in_(peer_ids)).all()
+
+        return ORJSONResponse({
             "data": [
                 {
                     "id": str(user.id),
@@ -41,92 +112,130 @@ async def get_connections(current_user: models.User = Depends(get_current_user),
                     "role": user.role.title() if user.role else "User",
                     "sport": user.sport,
                     "location": user.location,
-                    "isOnline": getattr(user, "is_online", False),
-                    "lastActive": user.last_seen.isoformat() if getattr(user, "last_seen", None) else None
+                    "isOnline": user.is_online,
+                    "lastActive": user.last_seen
                 }
                 for user in all_connections
             ]
-        }
+        })
     except Exception:
-        traceback.print_exc()
+        logger.exception("get_connections failed")
         raise HTTPException(status_code=500, detail="Failed to fetch connections")
 
 
 @router.get("/requests")
 async def get_connection_requests(current_user: models.User = Depends(get_current_user), db: Session = Depends(get_db)):
     try:
-        pending_requests = db.query(models.User).join(
-            models.connections,
-            models.connections.c.user_id == models.User.id
+        conn = models.connections.c
+        # My accepted peers, either direction
+        my_peers = union_all(
+            select(conn.connected_user_id.label("peer_id")).where(
+                conn.user_id == current_user.id, conn.status == 'accepted'
+            ),
+            select(conn.user_id).where(
+                conn.connected_user_id == current_user.id, conn.status == 'accepted'
+            )
+        ).cte("my_peers")
+        
+        # Requesters, request time and mutual count (requester -> X where X is my peer) in one query
+        requested = models.connections.alias("requested")
+        mutual = models.connections.alias("mutual")
+        pending_requests = db.query(
+            models.User, requested.c.created_at, func.count(mutual.c.connected_user_id)
+        ).join(
+            requested, requested.c.user_id == models.User.id
+        ).outerjoin(
+            mutual,
+            db_and(
+                mutual.c.user_id == models.User.id,
+                mutual.c.status == 'accepted',
+                mutual.c.connected_user_id.in_(select(my_peers.c.peer_id))
+            )
         ).filter(
-            models.connections.c.connected_user_id == current_user.id,
-            models.connections.c.status == 'pending'
-        ).all()
+            requested.c.connected_user_id == current_user.id,
+            requested.c.status == 'pending'
+        ).group_by(models.User.id, requested.c.created_at).all()
         
         formatted_requests = []
-        for user in pending_requests:
-            user_connections = db.query(models.connections.c.connected_user_id).filter(
-                models.connections.c.user_id == user.id,
-                models.connections.c.status == 'accepted'
-            ).subquery()
-            
-            mutual_count = db.query(models.connections).filter(
-                models.connections.c.user_id == current_user.id,
-                models.connections.c.connected_user_id.in_(user_connections),
-                models.connections.c.status == 'accepted'
-            ).count()
-            
-            request_info = db.query(models.connections.c.created_at).filter(
-                models.connections.c.user_id == user.id,
-                models.connections.c.connected_user_id == current_user.id
-            ).first()
-            
+        for user, requested_at, mutual_count in pending_requests:
             formatted_requests.append({
                 "id": str(user.id),
                 "name": user.name,
                 "profilePhoto": get_image_url(user.profile_photo or user.profile_image),
                 "sport": user.sport,
                 "role": user.role.title() if user.role else "User",
-                "requestTime": request_info.created_at.isoformat() if request_info else None,
+                "requestTime": requested_at.isoformat() if requested_at else None,
                 "mutualConnections": mutual_count
             })
         
         return {"data": formatted_requests}
     except Exception:
-        traceback.print_exc()
+        logger.exception("get_connection_requests failed")
         raise HTTPException(status_code=500, detail="Failed to fetch requests")
 
 
-@router.get("/suggestions")
+@router.get("/suggestions", response_class=ORJSONResponse)
 async def get_connection_suggestions(limit: int = Query(10, le=50), current_user: models.User = Depends(get_current_user), db: Session = Depends(get_db)):
+    cache_key = _suggestions_cache_key(current_user, limit)
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return ORJSONResponse({"data": cached})
+    
     try:
-        connected_ids_subquery = db.query(models.connections.c.connected_user_id).filter(
-            models.connections.c.user_id == current_user.id
-        ).union(
-            db.query(models.connections.c.user_id).filter(
-                models.connections.c.connected_user_id == current_user.id
+        def candidates():
+            return db.query(models.User).options(
+                load_only(
+                    models.User.id, models.User.name, models.User.profile_photo, models.User.profile_image,
+                    models.User.role, models.User.sport, models.User.location, models.User.is_online,
+                    models.User.last_seen, models.User.connection_count, models.User.ai_score,
+                    models.User.is_verified
+                )
+            ).filter(
+                models.User.id != current_user.id,
+                models.User.is_active == True,
+                ~_connected_to(current_user.id)
             )
-        ).subquery()
         
-        suggestions = db.query(models.User).filter(
-            models.User.id != current_user.id,
-            ~models.User.id.in_(connected_ids_subquery)
-        ).order_by(
-            (models.User.sport == current_user.sport).desc(),
-            (models.User.location == current_user.location).desc(),
-            func.random()
-        ).limit(limit).all()
+        # Same sport or location first: the OR is answered from ix_users_sport_active and
+        # ix_users_location_active, so only matching users are ranked, bounded by the LIMIT
+        match_conditions = [
+            column == value
+            for column, value in ((models.User.sport, current_user.sport), (models.User.location, current_user.location))
+            if value
+        ]
+        suggestions = []
+        if match_conditions:
+            suggestions = candidates().filter(
+                db_or(*match_conditions)
+            ).order_by(
+                *(condition.desc() for condition in match_conditions)
+            ).limit(limit).all()
+        
+        # Top up with a random id probe rather than ORDER BY random()
+        if len(suggestions) < limit:
+            seen_ids = [user.id for user in suggestions]
+            max_id = db.query(func.max(models.User.id)).scalar() or 0
+            for _ in range(SUGGESTION_SAMPLE_ATTEMPTS):
+                missing = limit - len(suggestions)
+                if missing <= 0 or max_id == 0:
+                    break
+                probe_ids = random.sample(range(1, max_id + 1), min(max_id, 2 * missing))
+                sampled = candidates().filter(
+                    models.User.id.in_(probe_ids),
+                    models.User.id.notin_(seen_ids)
+                ).limit(missing).all()
+                suggestions.extend(sampled)
+                seen_ids.extend(user.id for user in sampled)
+            
+            # Sparse id space: fill whatever is left deterministically
+            missing = limit - len(suggestions)
+            if missing > 0:
+                suggestions.extend(
+                    candidates().filter(models.User.id.notin_(seen_ids)).limit(missing).all()
+                )
         
         formatted_suggestions = []
         for user in suggestions:
-            connection_count = db.query(models.connections).filter(
-                db_or(
-                    models.connections.c.user_id == user.id,
-                    models.connections.c.connected_user_id == user.id
-                ),
-                models.connections.c.status == 'accepted'
-            ).count()
-            
             formatted_suggestions.append({
                 "id": str(user.id),
                 "name": user.name,
@@ -134,20 +243,21 @@ async def get_connection_suggestions(limit: int = Query(10, le=50), current_user
                 "role": user.role.title() if user.role else "User",
                 "sport": user.sport,
                 "location": user.location,
-                "isOnline": getattr(user, "is_online", False),
-                "lastActive": user.last_seen.isoformat() if getattr(user, "last_seen", None) else None,
-                "connections": connection_count,
-                "performance": f"AI Score: {user.ai_score}%" if getattr(user, "ai_score", None) else None,
-                "verified": getattr(user, "is_verified", False)
+                "isOnline": user.is_online,
+                "lastActive": user.last_seen,
+                "connections": user.connection_count,
+                "performance": f"AI Score: {user.ai_score}%" if user.ai_score else None,
+                "verified": user.is_verified
             })
         
-        return {"data": formatted_suggestions}
+        await cache_set(cache_key, formatted_suggestions, SUGGESTIONS_CACHE_TTL)
+        return ORJSONResponse({"data": formatted_suggestions})
     except Exception:
-        traceback.print_exc()
+        logger.exception("get_connection_suggestions failed")
         raise HTTPException(status_code=500, detail="Failed to fetch suggestions")
 
 
-@router.get("/available")
+@router.get("/available", response_class=ORJSONResponse)
 async def get_available_connections(
     role: Optional[str] = Query(None),
     sport: Optional[str] = Query(None),
@@ -155,132 +265,123 @@ async def get_available_connections(
     search: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(20, le=100),
+    cursor: Optional[int] = Query(None, description="next_cursor from the previous page; replaces page"),
+    include_total: bool = Query(False, description="Also return total/pages (cached, may lag by a minute)"),
     current_user: Optional[models.User] = Depends(get_current_user_optional),
     db: Session = Depends(get_db)
 ):
     try:
-        if current_user:
-            connected_ids_subquery = db.query(models.connections.c.connected_user_id).filter(
-                models.connections.c.user_id == current_user.id
-            ).union(
-                db.query(models.connections.c.user_id).filter(
-                    models.connections.c.connected_user_id == current_user.id
-                )
-            ).subquery()
-            
-            query = db.query(models.User).filter(
-                models.User.id != current_user.id,
-                ~models.User.id.in_(connected_ids_subquery),
-                models.User.is_active == True
-            )
-        else:
-            query = db.query(models.User).filter(
-                models.User.is_active == True
-            )
+        me_id = current_user.id if current_user else None
+        role_filter = role.lower().rstrip('s') if role and role != 'all' else None
         
-        if role and role != 'all':
-            role_filter = role.lower().rstrip('s')
-            query = query.filter(models.User.role == role_filter)
-        
-        if sport:
-            query = query.filter(models.User.sport.ilike(f'%{sport}%'))
-        
-        if location:
-            query = query.filter(models.User.location.ilike(f'%{location}%'))
+        # Plain column mappings, no ORM User instances; ordered by id so pages
+        # are stable and a keyset cursor can continue after the last row
+        offset = (page - 1) * limit
+        users_stmt = _available_criteria(
+            lambda_stmt(lambda: select(
+                models.User.id, models.User.name, models.User.profile_photo, models.User.profile_image,
+                models.User.role, models.User.sport, models.User.location, models.User.bio,
+                models.User.is_online, models.User.last_seen, models.User.ai_score, models.User.is_verified,
+                models.User.age, models.User.experience, models.User.achievements, models.User.connection_count
+            )),
+            me_id, role_filter, sport, location, search
+        )
+        if cursor is None:
+            users_stmt += lambda s: s.order_by(models.User.id).offset(offset).limit(limit + 1)
+        else:
+            # Keyset: an index range scan from the cursor, no rows skipped
+            users_stmt += lambda s: s.where(models.User.id > cursor).order_by(models.User.id).limit(limit + 1)
+        rows = db.execute(users_stmt).mappings().all()
+        users = rows[:limit]
+        next_cursor = users[-1]["id"] if len(rows) > limit else None
         
-        if search:
-            query = query.filter(
-                db_or(
-                    models.User.name.ilike(f'%{search}%'),
-                    models.User.sport.ilike(f'%{search}%'),
-                    models.User.location.ilike(f'%{search}%'),
-                    models.User.bio.ilike(f'%{search}%')
+        # The total reruns the whole filter, so it is opt-in and cached per viewer and filter set
+        total_count = None
+        if include_total:
+            count_key = f"conn:available:count:{me_id}:{role_filter}:{sport}:{location}:{search}"
+            total_count = await cache_get(count_key)
+            if total_count is None:
+                count_stmt = _available_criteria(
+                    lambda_stmt(lambda: select(func.count(models.User.id))),
+                    me_id, role_filter, sport, location, search
                 )
-            )
+                total_count = db.execute(count_stmt).scalar()
+                await cache_set(count_key, total_count, AVAILABLE_COUNT_CACHE_TTL)
         
-        total_count = query.count()
-        
-        offset = (page - 1) * limit
-        users = query.offset(offset).limit(limit).all()
+        # Batch-load pending requests for the whole page (no N+1)
+        pending_by_uid = {}
+        if current_user and users:
+            user_ids = [user["id"] for user in users]
+            
+            pending_rows = db.execute(lambda_stmt(
+                lambda: select(
+                    models.connections.c.user_id,
+                    models.connections.c.connected_user_id,
+                    models.connections.c.status
+                ).where(
+                    models.connections.c.status == 'pending',
+                    db_or(
+                        db_and(models.connections.c.user_id == me_id, models.connections.c.connected_user_id.in_(user_ids)),
+                        db_and(models.connections.c.connected_user_id == me_id, models.connections.c.user_id.in_(user_ids))
+                    )
+                )
+            )).all()
+            for row in pending_rows:
+                other_id = row.connected_user_id if row.user_id == me_id else row.user_id
+                pending_by_uid[other_id] = row.status
         
         formatted_users = []
         for user in users:
             user_data = {
-                "id": str(user.id),
-                "name": user.name,
-                "profilePhoto": get_image_url(user.profile_photo or user.profile_image),
-                "role": user.role.title() if user.role else "User",
-                "sport": user.sport or "Not specified",
-                "location": user.location or "Not specified",
-                "bio": user.bio,
-                "isOnline": getattr(user, 'is_online', False),
-                "lastActive": user.last_seen.isoformat() if getattr(user, 'last_seen', None) else None,
+                "id": str(user["id"]),
+                "name": user["name"],
+                "profilePhoto": get_image_url(user["profile_photo"] or user["profile_image"]),
+                "role": user["role"].title() if user["role"] else "User",
+                "sport": user["sport"] or "Not specified",
+                "location": user["location"] or "Not specified",
+                "bio": user["bio"],
+                "isOnline": user["is_online"],
+                "lastActive": user["last_seen"],
                 "connections": 0,
-                "performance": f"AI Score: {user.ai_score}%" if getattr(user, 'ai_score', None) else None,
-                "verified": getattr(user, 'is_verified', False),
-                "age": user.age,
-                "experience": user.experience,
-                "achievements": user.achievements,
+                "performance": f"AI Score: {user['ai_score']}%" if user["ai_score"] else None,
+                "verified": user["is_verified"],
+                "age": user["age"],
+                "experience": user["experience"],
+                "achievements": user["achievements"],
                 "hasPendingRequest": False,
                 "requestStatus": None
             }
             
             if current_user:
-                pending_request = db.query(models.connections).filter(
-                    db_or(
-                        db_and(
-                            models.connections.c.user_id == current_user.id,
-                            models.connections.c.connected_user_id == user.id,
-                            models.connections.c.status == 'pending'
-                        ),
-                        db_and(
-                            models.connections.c.user_id == user.id,
-                            models.connections.c.connected_user_id == current_user.id,
-                            models.connections.c.status == 'pending'
-                        )
-                    )
-                ).first()
-                
-                user_data["hasPendingRequest"] = pending_request is not None
-                user_data["requestStatus"] = pending_request.status if pending_request else None
-                
-                user_connections = db.query(models.connections).filter(
-                    db_or(
-                        db_and(
-                            models.connections.c.user_id == user.id,
-                            models.connections.c.status == 'accepted'
-                        ),
-                        db_and(
-                            models.connections.c.connected_user_id == user.id,
-                            models.connections.c.status == 'accepted'
-                        )
-                    )
-                ).count()
-                
-                user_data["connections"] = user_connections
+                user_data["hasPendingRequest"] = user["id"] in pending_by_uid
+                user_data["requestStatus"] = pending_by_uid.get(user["id"])
+                user_data["connections"] = user["connection_count"]
             
             formatted_users.append(user_data)
         
-        return {
+        pagination = {"limit": limit, "has_next": next_cursor is not None, "next_cursor": next_cursor}
+        if cursor is None:
+            pagination["page"] = page
+        if total_count is not None:
+            pagination["total"] = total_count
+            pagination["pages"] = (total_count + limit - 1) // limit
+        
+        return ORJSONResponse({
             "data": formatted_users,
-            "pagination": {
-                "total": total_count,
-                "page": page,
-                "limit": limit,
-                "pages": (total_count + limit - 1) // limit
-            }
-        }
+            "pagination": pagination
+        })
         
     except Exception as e:
-        print(f"Error in get_available_connections: {e}")
-        traceback.print_exc()
+        logger.exception("get_available_connections failed")
         return {
             "data": [],
             "pagination": {
                 "total": 0,
                 "page": page,
                 "limit": limit,
-                "pages": 0
+                "pages": 0,
+                "has_next": False,
+                "next_cursor": None
             }
         }
 
@@ -290,34 +391,28 @@ async def send_connection_request(user_id: int, current_user: models.User = Depe
     if user_id == current_user.id:
         raise HTTPException(status_code=400, detail="Cannot connect to yourself")
     
-    target_user = db.query(models.User).filter(models.User.id == user_id).first()
-    if not target_user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    existing = db.query(models.connections).filter(
-        db_or(
-            db_and(
-                models.connections.c.user_id == current_user.id,
-                models.connections.c.connected_user_id == user_id
-            ),
-            db_and(
-                models.connections.c.user_id == user_id,
-                models.connections.c.connected_user_id == current_user.id
-            )
-        )
-    ).first()
-    
-    if existing:
-        raise HTTPException(status_code=400, detail="Connection request already exists")
+    if not await acquire_guard(f"req:{current_user.id}:{user_id}", CONNECTION_REQUEST_GUARD_TTL):
+        raise HTTPException(status_code=429, detail="Too many requests")
     
-    stmt = models.connections.insert().values(
+    # One statement: uq_connections_pair turns an existing pair (either direction)
+    # into "no row returned", and the users FK rejects an unknown target
+    stmt = pg_insert(models.connections).values(
         user_id=current_user.id,
         connected_user_id=user_id,
         status='pending'
-    )
-    db.execute(stmt)
+    ).on_conflict_do_nothing().returning(models.connections.c.user_id)
+    try:
+        inserted = db.execute(stmt).first()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    if inserted is None:
+        raise HTTPException(status_code=400, detail="Connection request already exists")
+    
     db.commit()
     
+    await _invalidate_suggestions(current_user.id, user_id)
     return {"message": "Connection request sent successfully"}
 
 
@@ -333,7 +428,9 @@ async def accept_connection_request(user_id: int, current_user: models.User = De
     if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Connection request not found")
     
+    # users.connection_count is bumped by the connections_count trigger (migrations/006)
     db.commit()
+    await _invalidate_suggestions(current_user.id, user_id)
     return {"message": "Connection request accepted"}
 
 
@@ -350,24 +447,15 @@ async def reject_connection_request(user_id: int, current_user: models.User = De
         raise HTTPException(status_code=404, detail="Connection request not found")
     
     db.commit()
+    await _invalidate_suggestions(current_user.id, user_id)
     return {"message": "Connection request rejected"}
 
 
 @router.delete("/remove/{user_id}")
 async def remove_connection(user_id: int, current_user: models.User = Depends(get_current_user), db: Session = Depends(get_db)):
     stmt = models.connections.delete().where(
-        db_or(
-            db_and(
-                models.connections.c.user_id == current_user.id,
-                models.connections.c.connected_user_id == user_id,
-                models.connections.c.status == 'accepted'
-            ),
-            db_and(
-                models.connections.c.user_id == user_id,
-                models.connections.c.connected_user_id == current_user.id,
-                models.connections.c.status == 'accepted'
-            )
-        )
+        crud.connection_pair_filter(current_user.id, user_id),
+        models.connections.c.status == 'accepted'
     )
     
     result = db.execute(stmt)
@@ -375,6 +463,7 @@ async def remove_connection(user_id: int, current_user: models.User = Depends(ge
         raise HTTPException(status_code=404, detail="Connection not found")
     
     db.commit()
+    await _invalidate_suggestions(current_user.id, user_id)
     return {"message": "Connection removed"}
 
 
@@ -1,18 +1,32 @@
 # backend/api/message_ws.py
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
-from typing import Dict, List
+from typing import Dict, List, Optional
+from redis.exceptions import RedisError
+from core.cache import cache_publish, cache_pubsub
 from core.security import decode_access_token
-import traceback
+import asyncio
+import logging
+import orjson
 
 router = APIRouter(prefix="/ws", tags=["message-ws"])
+logger = logging.getLogger(__name__)
+
+# Messages are fanned out over Redis pub/sub so every uvicorn worker can
+# deliver to the sockets it holds
+WS_CHANNEL_PREFIX = "ws:conv:"
+WS_RESUBSCRIBE_DELAY = 1.0  # seconds
 
 class ConnectionManager:
     def __init__(self):
         self.active_connections: Dict[int, List[WebSocket]] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed = False
 
     async def connect(self, conv_id: int, websocket: WebSocket):
         await websocket.accept()
         self.active_connections.setdefault(conv_id, []).append(websocket)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
 
     def disconnect(self, conv_id: int, websocket: WebSocket):
         if conv_id in self.active_connections and websocket in self.active_connections[conv_id]:
@@ -21,6 +35,15 @@ class ConnectionManager:
                 del self.active_connections[conv_id]
 
     async def broadcast(self, conv_id: int, message: dict):
+        """
+        Publish to every worker; this worker's own sockets are served by its
+        listener. Without Redis, or before the listener has subscribed, send locally.
+        """
+        published = await cache_publish(f"{WS_CHANNEL_PREFIX}{conv_id}", message)
+        if not (published and self._subscribed):
+            await self._send_local(conv_id, message)
+
+    async def _send_local(self, conv_id: int, message: dict):
         conns = list(self.active_connections.get(conv_id, []))
         for ws in conns:
             try:
@@ -28,6 +51,26 @@ class ConnectionManager:
             except:
                 pass
 
+    async def _listen(self):
+        """Relay published messages to local sockets, resubscribing after Redis errors"""
+        pubsub = cache_pubsub()
+        if pubsub is None:
+            return
+        while True:
+            try:
+                await pubsub.psubscribe(f"{WS_CHANNEL_PREFIX}*")
+                self._subscribed = True
+                while True:
+                    msg = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if msg is None:
+                        continue
+                    conv_id = int(msg["channel"][len(WS_CHANNEL_PREFIX):])
+                    await self._send_local(conv_id, orjson.loads(msg["data"]))
+            except (RedisError, OSError, asyncio.TimeoutError) as exc:
+                self._subscribed = False
+                logger.warning("WebSocket fan-out subscription failed: %s", exc)
+                await asyncio.sleep(WS_RESUBSCRIBE_DELAY)
+
 manager = ConnectionManager()
 
 @router.websocket("/messages/{conversation_id}")
@@ -56,7 +99,7 @@ async def websocket_messages(websocket: WebSocket, conversation_id: int, token:
         except WebSocketDisconnect:
             manager.disconnect(conversation_id, websocket)
     except Exception:
-        traceback.print_exc()
+        logger.exception("websocket_messages failed")
         try:
             await websocket.close()
         except:
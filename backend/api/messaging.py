@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 from typing import Optional, List
 from fastapi import File, UploadFile
 from core.config import UPLOAD_DIR
-import shutil
+from core.uploads import save_upload
 from pathlib import Path
 
 from database import get_db
@@ -12,12 +12,13 @@ from core.dependencies import get_current_user, get_image_url
 import models, schemas
 from sqlalchemy import or_ as db_or, and_ as db_and
 from datetime import datetime
-import traceback
+import logging
 
 # Import the WebSocket manager for broadcasting
 from api.message_ws import manager as ws_manager
 
 router = APIRouter(prefix="/api", tags=["messaging"])
+logger = logging.getLogger(__name__)
 
 
 @router.get("/conversations")
@@ -54,11 +55,11 @@ async def get_conversations(current_user: models.User = Depends(get_current_user
                 "last_message_at": conv.last_message_at.isoformat() if conv.last_message_at else None,
                 "last_message_preview": conv.last_message_preview,
                 "unread_count": unread_count,
-                "is_online": getattr(other_user, "is_online", False)
+                "is_online": other_user.is_online
             })
         return {"data": formatted}
     except Exception:
-        traceback.print_exc()
+        logger.exception("get_conversations failed")
         raise HTTPException(status_code=500, detail="Failed to fetch conversations")
 
 
@@ -135,7 +136,7 @@ async def start_conversation(
     except HTTPException:
         raise
     except Exception:
-        traceback.print_exc()
+        logger.exception("start_conversation failed")
         raise HTTPException(status_code=500, detail="Failed to start conversation")
 
 
@@ -206,7 +207,7 @@ async def get_messages(
                     "profile_photo": get_image_url(other_user.profile_photo or other_user.profile_image), 
                     "sport": other_user.sport, 
                     "role": other_user.role, 
-                    "is_online": getattr(other_user, "is_online", False)
+                    "is_online": other_user.is_online
                 }
             }, 
             "messages": formatted, 
@@ -216,7 +217,7 @@ async def get_messages(
     except HTTPException:
         raise
     except Exception:
-        traceback.print_exc()
+        logger.exception("get_messages failed")
         raise HTTPException(status_code=500, detail="Failed to fetch messages")
 
 
@@ -279,13 +280,13 @@ async def send_message(
                 "message": response
             }))
         except Exception as ws_error:
-            print(f"WebSocket broadcast error: {ws_error}")
+            logger.warning("WebSocket broadcast failed for conversation %s: %s", conversation_id, ws_error)
         
         return response
     except HTTPException:
         raise
     except Exception:
-        traceback.print_exc()
+        logger.exception("send_message failed")
         raise HTTPException(status_code=500, detail="Failed to send message")
 
 
@@ -318,15 +319,14 @@ async def upload_message_attachment(
 
         Path(UPLOAD_DIR).mkdir(parents=True, exist_ok=True)
 
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        await save_upload(file, file_path)
 
         url = f"/uploads/{filename}"
         return {"attachment_url": url, "attachment_type": file.content_type}
     except HTTPException:
         raise
     except Exception:
-        traceback.print_exc()
+        logger.exception("upload_message_attachment failed")
         raise HTTPException(status_code=500, detail="Failed to upload attachment")
 
 
@@ -370,7 +370,7 @@ async def edit_message(
     except HTTPException:
         raise
     except Exception:
-        traceback.print_exc()
+        logger.exception("edit_message failed")
         raise HTTPException(status_code=500, detail="Failed to edit message")
 
 
@@ -407,7 +407,7 @@ async def delete_message(
     except HTTPException:
         raise
     except Exception:
-        traceback.print_exc()
+        logger.exception("delete_message failed")
         raise HTTPException(status_code=500, detail="Failed to delete message")
 
 
@@ -449,7 +449,7 @@ async def mark_conversation_read(
         
         return {"messages_marked": updated}
     except Exception:
-        traceback.print_exc()
+        logger.exception("mark_conversation_read failed")
         raise HTTPException(status_code=500, detail="Failed to mark conversation read")
 
 
@@ -478,7 +478,7 @@ async def get_unread_count(
         
         return {"unread_count": total_unread}
     except Exception:
-        traceback.print_exc()
+        logger.exception("get_unread_count failed")
         raise HTTPException(status_code=500, detail="Failed to compute unread count")
 
 
@@ -552,7 +552,7 @@ async def get_available_users_for_messaging(
                 "role": user.role.title() if user.role else "User",
                 "sport": user.sport,
                 "location": user.location,
-                "isOnline": getattr(user, "is_online", False),
+                "isOnline": user.is_online,
                 "existingConversationId": existing_conv.id if existing_conv else None
             })
         
@@ -566,5 +566,5 @@ async def get_available_users_for_messaging(
             }
         }
     except Exception:
-        traceback.print_exc()
+        logger.exception("get_available_users_for_messaging failed")
         raise HTTPException(status_code=500, detail="Failed to fetch available users")
\ No newline at end of file
@@ -4,13 +4,14 @@ from sqlalchemy.orm import Session
 from sqlalchemy import desc, or_ as db_or, and_ as db_and, func
 from typing import Optional, List
 from datetime import datetime, timedelta
-import traceback
 
 from database import get_db
 from core.dependencies import get_current_user, get_image_url
 import models
+import logging
 
 router = APIRouter(prefix="/api/notifications", tags=["notifications"])
+logger = logging.getLogger(__name__)
 
 
 # Notification model (add to models.py if not exists)
@@ -157,7 +158,7 @@ async def get_notifications(
         }
         
     except Exception:
-        traceback.print_exc()
+        logger.exception("get_notifications failed")
         raise HTTPException(status_code=500, detail="Failed to fetch notifications")
 
 
@@ -196,5 +197,5 @@ async def get_notification_count(
         return {"count": count}
         
     except Exception:
-        traceback.print_exc()
+        logger.exception("get_notification_count failed")
         return {"count": 0}
\ No newline at end of file
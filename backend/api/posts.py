@@ -1,16 +1,68 @@
 # backend/api/posts.py
 from fastapi import APIRouter, Depends, Form, File, UploadFile, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import bindparam, exists, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload, raiseload
 from typing import Optional, List
-from database import get_db
+from database import get_db, SessionLocal
 from core.dependencies import get_current_user, get_image_url
-from core.config import UPLOAD_DIR
+from core.cache import cache_get, cache_set, cache_incr, acquire_guard
+from core.config import UPLOAD_DIR, LIKE_GUARD_TTL, POSTS_COUNT_CACHE_TTL, UPLOAD_GC_MIN_AGE
+from core.uploads import collect_unreferenced_uploads, save_upload_content_addressed
 import models, schemas
-import shutil
 from datetime import datetime
-import traceback
+from pathlib import Path
+import logging
 
 router = APIRouter(prefix="/api/posts", tags=["posts"])
+logger = logging.getLogger(__name__)
+
+# Resolved once at import instead of on every request
+_HAS_POST_MODEL = hasattr(models, 'Post')
+_HAS_COMMENT_MODEL = hasattr(models, 'Comment')
+
+POSTS_COUNT_KEY = "posts:count"
+
+# Feed statements are built once; each request only binds parameters
+FEED_PAGE_STMT = (
+    select(models.Post)
+    .options(selectinload(models.Post.user).raiseload('*'), raiseload('*'))
+    .order_by(models.Post.created_at.desc())
+    .offset(bindparam('offset'))
+    .limit(bindparam('limit'))
+) if _HAS_POST_MODEL else None
+
+FEED_LIKED_STMT = select(models.post_likes.c.post_id).where(
+    models.post_likes.c.user_id == bindparam('user_id'),
+    models.post_likes.c.post_id.in_(bindparam('post_ids', expanding=True))
+)
+
+ALLOWED_POST_MEDIA_TYPES = {
+    "image/jpeg",
+    "image/png",
+    "image/gif",
+    "image/webp",
+    "video/mp4",
+    "video/quicktime",
+    "video/webm"
+}
+
+
+def collect_orphaned_post_media() -> int:
+    """
+    Remove post media no post points at any more (blocking).
+    Run periodically by the worker; returns the number of files deleted.
+    """
+    db = SessionLocal()
+    try:
+        referenced = set(db.scalars(select(models.Post.media_url).distinct()))
+    finally:
+        db.close()
+    return collect_unreferenced_uploads(
+        UPLOAD_DIR / "posts", "/uploads/posts/", referenced, UPLOAD_GC_MIN_AGE
+    )
 
 
 # Add this helper function at the top of the file
@@ -25,15 +77,21 @@ def get_image_url_with_fallback(image_path: Optional[str], name: str = "User") -
     return f"https://ui-avatars.com/api/?name={initials}&background=6366f1&color=fff&size=200"
 
 
-@router.get("/feed", response_model=None)
+@router.get("/feed", response_model=None, response_class=ORJSONResponse)
 async def get_feed_posts(page: int = Query(1, ge=1), limit: int = Query(10, le=50), current_user: models.User = Depends(get_current_user), db: Session = Depends(get_db)):
     offset = (page - 1) * limit
-    if not hasattr(models, 'Post'):
+    if not _HAS_POST_MODEL:
         return {"data": [], "total": 0, "page": page, "limit": limit}
-    posts = db.query(models.Post).options(joinedload(models.Post.user)).order_by(models.Post.created_at.desc()).offset(offset).limit(limit).all()
+    # selectinload keeps the page query one row per post; raiseload flags any accidental lazy load
+    posts = db.execute(FEED_PAGE_STMT, {"offset": offset, "limit": limit}).scalars().all()
+    liked_ids = set()
+    if posts:
+        liked_ids = set(db.execute(
+            FEED_LIKED_STMT, {"user_id": current_user.id, "post_ids": [p.id for p in posts]}
+        ).scalars())
     formatted = []
     for post in posts:
-        is_liked = db.query(models.post_likes).filter(models.post_likes.c.user_id == current_user.id, models.post_likes.c.post_id == post.id).first() is not None
+        is_liked = post.id in liked_ids
         formatted.append({
             "id": str(post.id),
             "user": {
@@ -53,10 +111,13 @@ async def get_feed_posts(page: int = Query(1, ge=1), limit: int = Query(10, le=5
             "comments_count": post.comments_count,
             "shares_count": post.shares_count,
             "is_liked": is_liked,
-            "created_at": post.created_at.isoformat()
+            "created_at": post.created_at
         })
-    total = db.query(models.Post).count()
-    return {"data": formatted, "total": total, "page": page, "limit": limit}
+    total = await cache_get(POSTS_COUNT_KEY)
+    if total is None:
+        total = db.query(models.Post).count()
+        await cache_set(POSTS_COUNT_KEY, total, POSTS_COUNT_CACHE_TTL)
+    return ORJSONResponse({"data": formatted, "total": total, "page": page, "limit": limit})
 
 
 @router.post("")
@@ -67,24 +128,22 @@ async def create_post(text: str = Form(...), media: Optional[UploadFile] = File(
             detail="Post text is required and cannot be empty"
         )
     
-    if not hasattr(models, 'Post'):
+    if not _HAS_POST_MODEL:
         raise HTTPException(status_code=501, detail="Posts feature not implemented yet")
     
     media_url = None
     media_type = None
     
     if media:
-        # Ensure directory exists
-        posts_dir = UPLOAD_DIR / "posts"
-        posts_dir.mkdir(parents=True, exist_ok=True)
-        
-        media_filename = f"{current_user.id}_{datetime.now().timestamp()}_{media.filename}"
-        media_path = posts_dir / media_filename
+        if media.content_type not in ALLOWED_POST_MEDIA_TYPES:
+            raise HTTPException(status_code=400, detail="Unsupported media type.")
         
-        with open(media_path, "wb") as buffer:
-            shutil.copyfileobj(media.file, buffer)
+        # Named by content hash (BLAKE2b) rather than timestamp + client filename,
+        # so names never collide and identical media is stored once
+        extension = Path(media.filename or "").suffix.lstrip(".") or media.content_type.split("/")[-1]
+        stored = await save_upload_content_addressed(media, UPLOAD_DIR / "posts", extension)
         
-        media_url = f"/uploads/posts/{media_filename}"
+        media_url = f"/uploads/posts/{stored}"
         media_type = "image" if media.content_type.startswith("image") else "video"
     
     post = models.Post(
@@ -98,34 +157,37 @@ async def create_post(text: str = Form(...), media: Optional[UploadFile] = File(
     db.add(post)
     db.commit()
     db.refresh(post)
+    await cache_incr(POSTS_COUNT_KEY)
     
     return {"message": "Post created successfully", "post_id": post.id}
 
 
 @router.post("/{post_id}/like")
 async def like_post(post_id: int, current_user: models.User = Depends(get_current_user), db: Session = Depends(get_db)):
-    if not hasattr(models, 'Post'):
+    if not _HAS_POST_MODEL:
         raise HTTPException(status_code=501, detail="Posts feature not implemented yet")
     
-    post = db.query(models.Post).filter(models.Post.id == post_id).first()
-    if not post:
-        raise HTTPException(status_code=404, detail="Post not found")
-    
-    existing_like = db.query(models.post_likes).filter(
-        models.post_likes.c.user_id == current_user.id,
-        models.post_likes.c.post_id == post_id
-    ).first()
+    if not await acquire_guard(f"lk:{current_user.id}:{post_id}", LIKE_GUARD_TTL):
+        raise HTTPException(status_code=429, detail="Too many requests")
     
-    if existing_like:
-        raise HTTPException(status_code=400, detail="Already liked")
-    
-    stmt = models.post_likes.insert().values(
+    # likes_count is bumped by the post_likes_count trigger (migrations/004)
+    stmt = pg_insert(models.post_likes).values(
         user_id=current_user.id,
         post_id=post_id
-    )
-    db.execute(stmt)
+    ).on_conflict_do_nothing(
+        constraint='uq_post_likes_user_post'
+    ).returning(models.post_likes.c.post_id)
+    
+    try:
+        liked = db.execute(stmt).first()
+    except IntegrityError:
+        # Foreign key violation: the post does not exist
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Post not found")
+    
+    if liked is None:
+        raise HTTPException(status_code=400, detail="Already liked")
     
-    post.likes_count += 1
     db.commit()
     
     return {"message": "Post liked successfully"}
@@ -133,37 +195,49 @@ async def like_post(post_id: int, current_user: models.User = Depends(get_curren
 
 @router.delete("/{post_id}/unlike")
 async def unlike_post(post_id: int, current_user: models.User = Depends(get_current_user), db: Session = Depends(get_db)):
-    if not hasattr(models, 'Post'):
+    if not _HAS_POST_MODEL:
         raise HTTPException(status_code=501, detail="Posts feature not implemented yet")
     
-    post = db.query(models.Post).filter(models.Post.id == post_id).first()
-    if not post:
-        raise HTTPException(status_code=404, detail="Post not found")
-    
     stmt = models.post_likes.delete().where(
         models.post_likes.c.user_id == current_user.id,
         models.post_likes.c.post_id == post_id
-    )
-    result = db.execute(stmt)
+    ).returning(models.post_likes.c.post_id)
+    unliked = db.execute(stmt).first()
     
-    if result.rowcount == 0:
+    if unliked is None:
+        if not db.query(exists().where(models.Post.id == post_id)).scalar():
+            raise HTTPException(status_code=404, detail="Post not found")
         raise HTTPException(status_code=400, detail="Not liked")
     
-    post.likes_count = max(0, post.likes_count - 1)
     db.commit()
     
     return {"message": "Post unliked successfully"}
 
 
 @router.get("/{post_id}/comments", response_model=None)
-async def get_comments(post_id: int, db: Session = Depends(get_db)):
-    if not hasattr(models, 'Comment'):
-        return {"data": []}
+async def get_comments(
+    post_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    before_created_at: Optional[datetime] = None,
+    before_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Newest comments first, one page at a time.
+    Paginate with the (before_created_at, before_id) keyset from next_cursor.
+    """
+    if not _HAS_COMMENT_MODEL:
+        return {"data": [], "next_cursor": None}
     
-    comments = db.query(models.Comment)\
+    query = db.query(models.Comment)\
         .filter(models.Comment.post_id == post_id)\
-        .options(joinedload(models.Comment.user))\
-        .order_by(models.Comment.created_at.desc())\
+        .options(selectinload(models.Comment.user).raiseload('*'), raiseload('*'))
+    if before_created_at is not None and before_id is not None:
+        query = query.filter(
+            tuple_(models.Comment.created_at, models.Comment.id) < (before_created_at, before_id)
+        )
+    comments = query.order_by(models.Comment.created_at.desc(), models.Comment.id.desc())\
+        .limit(limit)\
         .all()
     
     formatted_comments = []
@@ -179,16 +253,28 @@ async def get_comments(post_id: int, db: Session = Depends(get_db)):
             "created_at": comment.created_at.isoformat()
         })
     
-    return {"data": formatted_comments}
+    next_cursor = None
+    if len(comments) == limit:
+        last = comments[-1]
+        next_cursor = {"before_created_at": last.created_at.isoformat(), "before_id": last.id}
+    
+    return {"data": formatted_comments, "next_cursor": next_cursor}
 
 
 @router.post("/{post_id}/comments")
 async def add_comment(post_id: int, text: str = Form(...), current_user: models.User = Depends(get_current_user), db: Session = Depends(get_db)):
-    if not hasattr(models, 'Comment') or not hasattr(models, 'Post'):
+    if not _HAS_COMMENT_MODEL or not _HAS_POST_MODEL:
         raise HTTPException(status_code=501, detail="Comments feature not implemented yet")
     
-    post = db.query(models.Post).filter(models.Post.id == post_id).first()
-    if not post:
+    # Bump the counter in SQL (no read-modify-write); no row back means no such post
+    bumped = db.execute(
+        update(models.Post)
+        .where(models.Post.id == post_id)
+        .values(comments_count=func.coalesce(models.Post.comments_count, 0) + 1)
+        .returning(models.Post.id)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if bumped is None:
         raise HTTPException(status_code=404, detail="Post not found")
     
     comment = models.Comment(
@@ -198,11 +284,11 @@ async def add_comment(post_id: int, text: str = Form(...), current_user: models.
     )
     
     db.add(comment)
-    post.comments_count += 1
+    db.flush()
+    comment_id = comment.id
     db.commit()
-    db.refresh(comment)
     
-    return {"message": "Comment added successfully", "comment_id": comment.id}
+    return {"message": "Comment added successfully", "comment_id": comment_id}
 
 
 @router.get("/my-posts")
@@ -216,10 +302,10 @@ async def get_my_posts(
     try:
         offset = (page - 1) * limit
         
-        # Query posts by current user only
+        # Query posts by current user only; the author is current_user, so nothing else is loaded
         posts = db.query(models.Post)\
             .filter(models.Post.user_id == current_user.id)\
-            .options(joinedload(models.Post.user))\
+            .options(raiseload('*'))\
             .order_by(models.Post.created_at.desc())\
             .offset(offset)\
             .limit(limit)\
@@ -236,11 +322,11 @@ async def get_my_posts(
                 "id": str(post.id),
                 "user_id": str(post.user_id),
                 "user": {
-                    "id": str(post.user.id),
-                    "name": post.user.name,
-                    "profile_photo": get_image_url_with_fallback(post.user.profile_photo or post.user.profile_image, post.user.name),
-                    "sport": post.user.sport,
-                    "location": post.user.location
+                    "id": str(current_user.id),
+                    "name": current_user.name,
+                    "profile_photo": get_image_url_with_fallback(current_user.profile_photo or current_user.profile_image, current_user.name),
+                    "sport": current_user.sport,
+                    "location": current_user.location
                 },
                 "text": post.text,
                 "content": {
@@ -257,7 +343,7 @@ async def get_my_posts(
                 "created_at": post.created_at.isoformat() if post.created_at else None
             })
         
-        print(f"[MY-POSTS] User {current_user.id} has {total} posts, returning {len(formatted)}")
+        logger.debug("User %s has %s posts, returning %s", current_user.id, total, len(formatted))
         
         return {
             "data": formatted, 
@@ -267,8 +353,7 @@ async def get_my_posts(
             "user_id": current_user.id
         }
     except Exception as e:
-        print(f"Error in get_my_posts: {e}")
-        traceback.print_exc()
+        logger.exception("get_my_posts failed")
         return {"data": [], "total": 0, "page": page, "limit": limit, "error": str(e)}
 
 
@@ -339,7 +424,7 @@ async def get_posts_by_user(
             models.Post.user_id == user_id
         ).count()
         
-        print(f"Found {len(formatted_posts)} posts for user {user_id}")
+        logger.debug("Found %s posts for user %s", len(formatted_posts), user_id)
         
         return {
             "data": formatted_posts,
@@ -351,5 +436,5 @@ async def get_posts_by_user(
     except HTTPException:
         raise
     except Exception as e:
-        traceback.print_exc()
+        logger.exception("get_posts_by_user failed")
         raise HTTPException(status_code=500, detail=f"Failed to fetch user posts: {str(e)}")
\ No newline at end of file
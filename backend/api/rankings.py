@@ -3,13 +3,15 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, func
 from typing import Optional
-import traceback
 
 from database import get_db
 from core.dependencies import get_current_user, get_current_user_optional, get_image_url
+from api.users import invalidate_user_cache, invalidate_all_user_caches
 import models
+import logging
 
 router = APIRouter(prefix="/api/rankings", tags=["rankings"])
+logger = logging.getLogger(__name__)
 
 
 @router.get("/national")
@@ -38,9 +40,12 @@ async def get_national_rankings(
         
         # Assign rankings
         rankings = []
+        ranks_changed = False
         for rank, athlete in enumerate(athletes, 1):
             # Update rank in database
-            athlete.national_rank = rank
+            if athlete.national_rank != rank:
+                athlete.national_rank = rank
+                ranks_changed = True
             
             rankings.append({
                 "rank": rank,
@@ -50,10 +55,12 @@ async def get_national_rankings(
                 "sport": athlete.sport,
                 "location": athlete.location,
                 "ai_score": athlete.ai_score,
-                "is_verified": getattr(athlete, 'is_verified', False)
+                "is_verified": athlete.is_verified
             })
         
         db.commit()
+        if ranks_changed:
+            await invalidate_all_user_caches()
         
         # Paginate
         start = (page - 1) * limit
@@ -68,7 +75,7 @@ async def get_national_rankings(
         }
         
     except Exception:
-        traceback.print_exc()
+        logger.exception("get_national_rankings failed")
         raise HTTPException(status_code=500, detail="Failed to fetch rankings")
 
 
@@ -120,6 +127,7 @@ async def get_user_rank(
         # Update user's national_rank
         user.national_rank = rank
         db.commit()
+        await invalidate_user_cache(user.id, user.email)
         
         return {
             "user_id": user_id,
@@ -132,7 +140,7 @@ async def get_user_rank(
     except HTTPException:
         raise
     except Exception:
-        traceback.print_exc()
+        logger.exception("get_user_rank failed")
         raise HTTPException(status_code=500, detail="Failed to calculate rank")
 
 
@@ -143,8 +151,11 @@ async def get_my_rank(
 ):
     """Get current user's national rank"""
     try:
+        # Read the score fresh; the authenticated user may come from the auth cache
+        ai_score = db.query(models.User.ai_score).filter(models.User.id == current_user.id).scalar()
+        
         # If no AI score, return null
-        if not current_user.ai_score or current_user.ai_score <= 0:
+        if not ai_score or ai_score <= 0:
             return {
                 "user_id": current_user.id,
                 "name": current_user.name,
@@ -163,7 +174,7 @@ async def get_my_rank(
             models.User.is_active == True,
             models.User.id != current_user.id,
             models.User.ai_score.isnot(None),
-            models.User.ai_score > current_user.ai_score
+            models.User.ai_score > ai_score
         ).count()
         
         rank = higher_count + 1
@@ -181,6 +192,7 @@ async def get_my_rank(
         # Update rank
         current_user.national_rank = rank
         db.commit()
+        await invalidate_user_cache(current_user.id, current_user.email)
         
         return {
             "user_id": current_user.id,
@@ -190,9 +202,9 @@ async def get_my_rank(
             "national_rank": rank,
             "total_athletes": total,
             "percentile": percentile,
-            "ai_score": current_user.ai_score
+            "ai_score": ai_score
         }
         
     except Exception:
-        traceback.print_exc()
+        logger.exception("get_my_rank failed")
         raise HTTPException(status_code=500, detail="Failed to calculate rank")
\ No newline at end of file
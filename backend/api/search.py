@@ -3,13 +3,14 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import or_ as db_or, func
 from typing import Optional
-import traceback
 
 from database import get_db
 from core.dependencies import get_current_user, get_current_user_optional, get_image_url
 import models
+import logging
 
 router = APIRouter(prefix="/api/search", tags=["search"])
+logger = logging.getLogger(__name__)
 
 
 @router.get("")
@@ -59,7 +60,7 @@ async def search(
                     "location": a.location,
                     "ai_score": a.ai_score,
                     "national_rank": a.national_rank,
-                    "is_verified": getattr(a, 'is_verified', False)
+                    "is_verified": a.is_verified
                 }
                 for a in athletes
             ]
@@ -85,7 +86,7 @@ async def search(
                     "sport": c.sport or c.specialization,
                     "location": c.location,
                     "experience": c.experience,
-                    "is_verified": getattr(c, 'is_verified', False)
+                    "is_verified": c.is_verified
                 }
                 for c in coaches
             ]
@@ -125,7 +126,7 @@ async def search(
         return results
         
     except Exception:
-        traceback.print_exc()
+        logger.exception("search failed")
         raise HTTPException(status_code=500, detail="Search failed")
 
 
@@ -170,5 +171,5 @@ async def get_search_suggestions(
         return {"suggestions": suggestions[:8]}
         
     except Exception:
-        traceback.print_exc()
+        logger.exception("get_search_suggestions failed")
         return {"suggestions": []}
\ No newline at end of file
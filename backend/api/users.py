@@ -1,19 +1,21 @@
 # backend/api/users.py
 # backend/api/users.py - Line with error
-from sqlalchemy import or_ as db_or, and_ as db_and  # ADD THIS IMPORT AT TOP
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form, Request
+from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Form, Query, Request, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select, union
 from typing import Optional, Dict, Tuple
-from core.dependencies import get_current_user, get_current_user_optional, get_image_url
-from core.config import UPLOAD_DIR
-from database import get_db
+from core.dependencies import get_current_user, get_current_user_optional, get_image_url, invalidate_auth_cache
+from core.cache import cache_get_raw, cache_set, cache_delete, cache_delete_pattern
+from core.config import UPLOAD_DIR, USER_CACHE_TTL, USER_STATS_STALE_TTL, UPLOAD_GC_MIN_AGE
+from core.uploads import collect_unreferenced_uploads, save_upload_content_addressed
+from database import get_db, SessionLocal
 import crud, models, schemas
 from datetime import datetime, timedelta
-import shutil
-import traceback
+import logging
 
 router = APIRouter(prefix="/api/users", tags=["users"])
+logger = logging.getLogger(__name__)
 
 
 # ============================================================================
@@ -131,7 +133,7 @@ def update_user_scores_and_rank(user_id: int, db: Session) -> Tuple[Optional[flo
     # Calculate average of best scores
     ai_score, _ = calculate_average_of_best_scores(user_id, db)
     
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = db.get(models.User, user_id)
     if not user:
         return None, None
     
@@ -149,16 +151,52 @@ def update_user_scores_and_rank(user_id: int, db: Session) -> Tuple[Optional[flo
     return ai_score, rank
 
 
+async def invalidate_user_cache(user_id: int, email: str) -> None:
+    """Drop the cached /me and /stats responses and the auth row after the user's row changes"""
+    await cache_delete(f"user:me:{user_id}", f"user:stats:{user_id}", f"user:stats:{user_id}:stale")
+    await invalidate_auth_cache(email)
+
+
+async def invalidate_all_user_caches() -> None:
+    """Drop every cached auth row and /me response after a bulk write to users (e.g. a rank recompute)"""
+    await cache_delete_pattern("auth:user:*")
+    await cache_delete_pattern("user:me:*")
+
+
+def collect_orphaned_profile_images() -> int:
+    """
+    Remove profile images no user points at any more (blocking).
+    Run periodically by the worker; returns the number of files deleted.
+    """
+    db = SessionLocal()
+    try:
+        referenced = set(db.scalars(union(
+            select(models.User.profile_image), select(models.User.profile_photo)
+        )))
+    finally:
+        db.close()
+    return collect_unreferenced_uploads(
+        UPLOAD_DIR / "profiles", "/uploads/profiles/", referenced, UPLOAD_GC_MIN_AGE
+    )
+
+
 # ============================================================================
 # API ENDPOINTS
 # ============================================================================
 
 @router.get("/me", response_model=schemas.UserProfile)
-def get_me(current_user: models.User = Depends(get_current_user)):
-    return current_user
+async def get_me(current_user: models.User = Depends(get_current_user)):
+    cache_key = f"user:me:{current_user.id}"
+    cached = await cache_get_raw(cache_key)
+    if cached is not None:
+        return Response(cached, media_type="application/json")
+    
+    profile = schemas.UserProfile.model_validate(current_user).model_dump(mode="json")
+    await cache_set(cache_key, profile, USER_CACHE_TTL)
+    return ORJSONResponse(profile)
 
 
-@router.get("/stats")
+@router.get("/stats", response_class=ORJSONResponse)
 async def get_user_stats(
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -166,7 +204,13 @@ async def get_user_stats(
     """
     Get user stats with AI score calculated as average of BEST scores per assessment type.
     This is used by Home page for display and ranking.
+    Cached briefly per user; the last good response is served if the database fails.
     """
+    cache_key = f"user:stats:{current_user.id}"
+    cached = await cache_get_raw(cache_key)
+    if cached is not None:
+        return Response(cached, media_type="application/json")
+    
     try:
         # Calculate AI score as average of BEST scores per type
         ai_score, best_scores_by_type = calculate_average_of_best_scores(current_user.id, db)
@@ -188,6 +232,7 @@ async def get_user_stats(
         weekly_progress = calculate_weekly_progress(current_user.id, db)
         current_user.weekly_progress = weekly_progress
         db.commit()
+        await invalidate_user_cache(current_user.id, current_user.email)
         
         # Get total athletes for context
         total_athletes = db.query(models.User).filter(
@@ -223,7 +268,7 @@ async def get_user_stats(
             for stat in assessment_stats
         }
         
-        return {
+        result = {
             "data": {
                 "id": current_user.id,
                 "name": current_user.name,
@@ -239,13 +284,20 @@ async def get_user_stats(
                 "percentile": percentile,
                 "bestScoresByType": best_scores_by_type,
                 "assessmentBreakdown": assessment_breakdown,
-                "isVerified": getattr(current_user, 'is_verified', False),
+                "isVerified": current_user.is_verified,
                 "scoreCalculation": "Average of best scores per assessment type"
             }
         }
     except Exception:
-        traceback.print_exc()
+        logger.exception("get_user_stats failed")
+        stale = await cache_get_raw(f"{cache_key}:stale")
+        if stale is not None:
+            return Response(stale, media_type="application/json")
         raise HTTPException(status_code=500, detail="Failed to fetch user stats")
+    
+    await cache_set(cache_key, result, USER_CACHE_TTL)
+    await cache_set(f"{cache_key}:stale", result, USER_STATS_STALE_TTL)
+    return ORJSONResponse(result)
 
 
 @router.get("/stats/detailed")
@@ -312,10 +364,59 @@ async def get_detailed_user_stats(
             }
         }
     except Exception:
-        traceback.print_exc()
+        logger.exception("get_detailed_user_stats failed")
         raise HTTPException(status_code=500, detail="Failed to fetch detailed stats")
 
 
+# period -> (date_trunc bucket, window) for GET /performance
+PERFORMANCE_PERIODS: Dict[str, Tuple[str, timedelta]] = {
+    "day": ("hour", timedelta(days=1)),
+    "week": ("day", timedelta(weeks=1)),
+    "month": ("day", timedelta(days=30)),
+    "year": ("week", timedelta(days=365)),
+}
+
+
+@router.get("/performance")
+async def get_performance_data(
+    period: str = Query("week", pattern="^(day|week|month|year)$"),
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Current user's performance metrics over the period, averaged per time bucket
+    (hourly for a day, daily for a week/month, weekly for a year) in the database.
+    """
+    bucket, window = PERFORMANCE_PERIODS[period]
+    bucket_start = func.date_trunc(bucket, models.PerformanceData.recorded_at).label("t")
+    
+    rows = db.query(
+        bucket_start,
+        models.PerformanceData.metric_type,
+        func.avg(models.PerformanceData.value).label("value"),
+        models.PerformanceData.unit
+    ).filter(
+        models.PerformanceData.user_id == current_user.id,
+        models.PerformanceData.recorded_at >= datetime.utcnow() - window
+    ).group_by(
+        bucket_start, models.PerformanceData.metric_type, models.PerformanceData.unit
+    ).order_by(bucket_start).all()
+    
+    return {
+        "period": period,
+        "bucket": bucket,
+        "data": [
+            {
+                "recorded_at": row.t.isoformat(),
+                "metric_type": row.metric_type,
+                "value": round(row.value, 2) if row.value is not None else None,
+                "unit": row.unit
+            }
+            for row in rows
+        ]
+    }
+
+
 @router.put("/profile")
 async def update_profile(
     age: int = Form(...),
@@ -330,42 +431,40 @@ async def update_profile(
     db: Session = Depends(get_db)
 ):
     try:
-        user = db.query(models.User).filter(models.User.id == userId).first()
-        if not user:
-            raise HTTPException(status_code=404, detail=f"User with id {userId} not found")
-
-        user.age = age
-        user.location = location.strip()
+        values = {"age": age, "location": location.strip()}
         if bio:
-            user.bio = bio.strip()
+            values["bio"] = bio.strip()
         if height:
-            user.height = height.strip()
+            values["height"] = height.strip()
         if weight:
-            user.weight = weight.strip()
+            values["weight"] = weight.strip()
         if achievements:
-            user.achievements = achievements
+            values["achievements"] = achievements
         if skills:
-            user.skills = skills
+            values["skills"] = skills
 
         if profileImage and profileImage.filename:
             extension = profileImage.filename.split(".")[-1].lower()
             if extension == "jpeg":
                 extension = "jpg"
-            file_name = f"profile_{userId}_{datetime.now().timestamp()}.{extension}"
-            file_path = UPLOAD_DIR / file_name
+            # Named by content hash, so re-uploading the same image reuses the file
+            stored = await save_upload_content_addressed(profileImage, UPLOAD_DIR / "profiles", extension)
 
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(profileImage.file, buffer)
+            image_url = f"/uploads/profiles/{stored}"
+            values["profile_image"] = image_url
+            values["profile_photo"] = image_url
 
-            image_url = f"/uploads/{file_name}"
-            user.profile_image = image_url
-            user.profile_photo = image_url
+        # Single UPDATE ... RETURNING; no row back means the user doesn't exist
+        user = crud.update_user(db, userId, values)
+        if not user:
+            raise HTTPException(status_code=404, detail=f"User with id {userId} not found")
 
         # Recalculate AI score and rank using BEST average
         ai_score, national_rank = update_user_scores_and_rank(userId, db)
 
         db.commit()
         db.refresh(user)
+        await invalidate_user_cache(user.id, user.email)
 
         return {
             "message": "Profile updated successfully",
@@ -393,7 +492,7 @@ async def update_profile(
         raise
     except Exception as e:
         db.rollback()
-        traceback.print_exc()
+        logger.exception("update_profile failed")
         raise HTTPException(status_code=500, detail=str(e))
 
 # Add this endpoint to backend/api/users.py
@@ -420,16 +519,7 @@ async def get_user_by_id(
         
         # Check connection status
         connection = db.query(models.connections).filter(
-            db_or(
-                db_and(
-                    models.connections.c.user_id == current_user.id,
-                    models.connections.c.connected_user_id == user_id
-                ),
-                db_and(
-                    models.connections.c.user_id == user_id,
-                    models.connections.c.connected_user_id == current_user.id
-                )
-            )
+            crud.connection_pair_filter(current_user.id, user_id)
         ).first()
         
         connection_status = None
@@ -442,14 +532,8 @@ async def get_user_by_id(
             models.Assessment.ai_score.isnot(None)
         ).count()
         
-        # Get connection count
-        connection_count = db.query(models.connections).filter(
-            db_or(
-                models.connections.c.user_id == user_id,
-                models.connections.c.connected_user_id == user_id
-            ),
-            models.connections.c.status == 'accepted'
-        ).count()
+        # Denormalized accepted-connection count (see api/connections.py)
+        connection_count = user.connection_count
         
         return {
             "user": {
@@ -483,5 +567,5 @@ async def get_user_by_id(
     except HTTPException:
         raise
     except Exception:
-        traceback.print_exc()
+        logger.exception("get_user_by_id failed")
         raise HTTPException(status_code=500, detail="Failed to fetch user")
\ No newline at end of file
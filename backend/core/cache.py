@@ -0,0 +1,138 @@
+# backend/core/cache.py
+
+import logging
+from typing import Any, Optional
+
+import orjson
+import redis.asyncio as redis
+
+from core.config import REDIS_URL, CACHE_CONNECT_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+# Connections are opened lazily, so importing this module never touches Redis
+_client = redis.from_url(
+    REDIS_URL,
+    socket_connect_timeout=CACHE_CONNECT_TIMEOUT,
+    socket_timeout=CACHE_CONNECT_TIMEOUT,
+) if REDIS_URL else None
+
+
+async def cache_get(key: str) -> Optional[Any]:
+    """
+    Return the decoded value stored under key, or None on a miss.
+    Redis being unavailable is treated as a miss.
+    """
+    if _client is None:
+        return None
+    try:
+        raw = await _client.get(key)
+    except (redis.RedisError, OSError) as exc:
+        logger.warning("Cache read failed for %s: %s", key, exc)
+        return None
+    return orjson.loads(raw) if raw is not None else None
+
+
+async def cache_get_raw(key: str) -> Optional[bytes]:
+    """
+    Like cache_get, but return the stored JSON bytes without decoding them,
+    so a cached response body can be sent as-is.
+    """
+    if _client is None:
+        return None
+    try:
+        return await _client.get(key)
+    except (redis.RedisError, OSError) as exc:
+        logger.warning("Cache read failed for %s: %s", key, exc)
+        return None
+
+
+async def cache_set(key: str, value: Any, ttl: Optional[int]) -> None:
+    """
+    Store value under key for ttl seconds (ttl=None keeps it until overwritten).
+    Failures are logged and ignored.
+    """
+    if _client is None:
+        return
+    try:
+        if ttl is None:
+            await _client.set(key, orjson.dumps(value))
+        else:
+            await _client.setex(key, ttl, orjson.dumps(value))
+    except (redis.RedisError, OSError) as exc:
+        logger.warning("Cache write failed for %s: %s", key, exc)
+
+
+async def cache_delete(*keys: str) -> None:
+    """Delete the given keys; failures are logged and ignored"""
+    if _client is None or not keys:
+        return
+    try:
+        await _client.delete(*keys)
+    except (redis.RedisError, OSError) as exc:
+        logger.warning("Cache invalidation failed for %s: %s", ", ".join(keys), exc)
+
+
+async def cache_delete_pattern(pattern: str) -> None:
+    """Delete every key matching a glob pattern (SCAN + DEL)"""
+    if _client is None:
+        return
+    try:
+        keys = [key async for key in _client.scan_iter(match=pattern, count=100)]
+        if keys:
+            await _client.delete(*keys)
+    except (redis.RedisError, OSError) as exc:
+        logger.warning("Cache invalidation failed for %s: %s", pattern, exc)
+
+
+async def cache_publish(channel: str, message: Any) -> bool:
+    """
+    Publish message on a pub/sub channel. Returns False when Redis is
+    disabled or unavailable, so the caller can deliver locally instead.
+    """
+    if _client is None:
+        return False
+    try:
+        await _client.publish(channel, orjson.dumps(message))
+    except (redis.RedisError, OSError) as exc:
+        logger.warning("Cache publish failed for %s: %s", channel, exc)
+        return False
+    return True
+
+
+def cache_pubsub():
+    """A PubSub handle on the shared client, or None when caching is disabled"""
+    return _client.pubsub() if _client is not None else None
+
+
+# INCRBY only when the key is already cached, so a cold key is re-seeded from the DB
+_INCR_IF_EXISTS = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('INCRBY', KEYS[1], ARGV[1])
+end
+return nil
+"""
+
+
+async def cache_incr(key: str, amount: int = 1) -> None:
+    """Adjust a cached counter in place; failures are logged and ignored"""
+    if _client is None:
+        return
+    try:
+        await _client.eval(_INCR_IF_EXISTS, 1, key, amount)
+    except (redis.RedisError, OSError) as exc:
+        logger.warning("Cache increment failed for %s: %s", key, exc)
+
+
+async def acquire_guard(key: str, ttl: int) -> bool:
+    """
+    Atomically claim key for ttl seconds (SET NX EX). Returns False if it is
+    already held, i.e. the same action was just performed. Fails open.
+    """
+    if _client is None:
+        return True
+    try:
+        return bool(await _client.set(key, 1, nx=True, ex=ttl))
+    except (redis.RedisError, OSError) as exc:
+        logger.warning("Cache guard failed for %s: %s", key, exc)
+        return True
@@ -0,0 +1,84 @@
+# backend/core/compression.py
+
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Already-compressed bodies (videos, images, raw files) are passed through untouched:
+# gzipping them gains nothing and would re-encode up to 100 MB in the event loop
+UNCOMPRESSED_MEDIA_PREFIXES = ("video/", "image/", "application/octet-stream")
+
+
+class MediaAwareGZipMiddleware:
+    """
+    GZip API and dashboard responses; media responses, bodies that already
+    carry a Content-Encoding, and /uploads are sent raw. Plain ASGI middleware:
+    the decision is made from the Content-Type in http.response.start.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 500, compresslevel: int = 9) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith("/uploads/"):
+            await self.app(scope, receive, send)
+            return
+        if "gzip" not in Headers(scope=scope).get("accept-encoding", ""):
+            await self.app(scope, receive, send)
+            return
+
+        start: Message = {}
+        passthrough = False
+        compressor = None
+
+        async def send_maybe_gzipped(message: Message) -> None:
+            nonlocal passthrough, compressor
+            if passthrough or message["type"] not in ("http.response.start", "http.response.body"):
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if (
+                    "content-encoding" in headers
+                    or headers.get("content-type", "").startswith(UNCOMPRESSED_MEDIA_PREFIXES)
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Held until the first body chunk shows whether compressing pays off
+                    start.update(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = zlib.compressobj(self.compresslevel, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+                headers = MutableHeaders(scope=start)
+                headers["Content-Encoding"] = "gzip"
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    body = compressor.compress(body) + compressor.flush()
+                    headers["Content-Length"] = str(len(body))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(start)
+
+            data = compressor.compress(body)
+            if not more_body:
+                data += compressor.flush()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_maybe_gzipped)
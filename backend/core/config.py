@@ -18,6 +18,14 @@ UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 (UPLOAD_DIR / "assessments").mkdir(exist_ok=True)
 (UPLOAD_DIR / "profiles").mkdir(exist_ok=True)
 
+# Upload limits
+MAX_ASSESSMENT_VIDEO_SIZE = 100 * 1024 * 1024  # 100 MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB
+UPLOADS_MAX_AGE = 86400  # seconds clients may cache files under /uploads
+UPLOAD_GC_MIN_AGE = 24 * 3600  # seconds an unreferenced upload is kept before the worker deletes it
+# Set SERVE_UPLOADS=0 when a front server (e.g. nginx with sendfile) serves UPLOAD_DIR at /uploads
+SERVE_UPLOADS = os.getenv("SERVE_UPLOADS", "1").lower() not in ("0", "false", "no")
+
 # Database settings from .env
 DB_USER = os.getenv("DB_USER", "postgres")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "arnald2826")
@@ -38,6 +46,37 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here").strip('"').strip("'
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Cache (Redis); set REDIS_URL to an empty string to disable caching
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+CACHE_CONNECT_TIMEOUT = 0.5  # seconds
+SUGGESTIONS_CACHE_TTL = 60  # seconds
+POSTS_COUNT_CACHE_TTL = 300  # seconds; bounds drift of the cached feed total
+AVAILABLE_COUNT_CACHE_TTL = 60  # seconds; /api/connections/available?include_total=true
+USER_CACHE_TTL = 30  # seconds; /api/users/me and /api/users/stats
+USER_STATS_STALE_TTL = 6 * 3600  # seconds the /api/users/stats fallback for DB outages is kept
+AUTH_USER_CACHE_TTL = 30  # seconds a token's user row is served from Redis
+ADMIN_CACHE_TTL = 10  # seconds; admin listings also keep a stale copy for DB outages
+ADMIN_STALE_TTL = 6 * 3600  # seconds a stale copy is kept; the keys embed filters and cursors
+ADMIN_DASHBOARD_MAX_AGE = 30  # seconds browsers may reuse /admin/dashboard before revalidating its ETag
+ADMIN_SCAN_BATCH_SIZE = 1000  # rows per fetch when an admin report streams a whole table
+LIKE_GUARD_TTL = 2  # seconds between repeat like attempts on the same post
+CONNECTION_REQUEST_GUARD_TTL = 5  # seconds between repeat requests to the same user
+ASSESSMENT_RESULT_CACHE_TTL = 3600  # seconds a finished analysis stays available to status polling
+
+# Background jobs (arq worker, same Redis)
+ASSESSMENT_JOB_TIMEOUT = 600  # seconds; long videos take minutes to analyze
+ASSESSMENT_WORKER_MAX_JOBS = 2  # analyses are CPU-bound, keep worker concurrency low
+# Without a job queue, analyze in the API process (single-process/dev setups) instead of answering 503
+ASSESSMENT_INLINE_FALLBACK = os.getenv("ASSESSMENT_INLINE_FALLBACK", "0").lower() not in ("0", "false", "no")
+
+# Server
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))  # uvicorn worker processes
+GZIP_MINIMUM_SIZE = 1024  # bytes; smaller responses are sent uncompressed
+GZIP_COMPRESS_LEVEL = 6  # level 9 costs far more CPU for a few percent smaller bodies
+
+# Logging
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
 
 # Simple settings class for compatibility
 class Settings:
@@ -2,14 +2,17 @@
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import DateTime
+from sqlalchemy.orm import Session, make_transient_to_detached
 from typing import Optional
+from datetime import datetime
 from jose import JWTError, jwt
 import urllib.parse
 
 from database import get_db
 import models
-from core.config import SECRET_KEY, ALGORITHM, BASE_URL
+from core.cache import cache_get, cache_set, cache_delete
+from core.config import SECRET_KEY, ALGORITHM, BASE_URL, AUTH_USER_CACHE_TTL
 
 security = HTTPBearer(auto_error=False)
 
@@ -106,6 +109,47 @@ def get_image_url_with_fallback(image_path: Optional[str], name: str = 'User', s
 # AUTHENTICATION DEPENDENCIES
 # ============================================================================
 
+# Token subject (email) -> User column values, kept in Redis so one
+# invalidate_auth_cache call reaches every worker. The password hash is never cached.
+_USER_COLUMNS = [c for c in models.User.__table__.columns if c.key != "password"]
+
+
+def _auth_cache_key(email: str) -> str:
+    return f"auth:user:{email}"
+
+
+def _user_to_row(user: models.User) -> dict:
+    return {c.key: getattr(user, c.key) for c in _USER_COLUMNS}
+
+
+def _row_to_user(row: dict, db: Session) -> models.User:
+    """Attach a cached row to the session without querying (merge with load=False)"""
+    values = dict(row)
+    for c in _USER_COLUMNS:
+        # orjson stores datetimes as ISO strings
+        if isinstance(c.type, DateTime) and isinstance(values.get(c.key), str):
+            values[c.key] = datetime.fromisoformat(values[c.key])
+    user = models.User(**values)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+async def _get_user_by_token_subject(email: str, db: Session) -> Optional[models.User]:
+    row = await cache_get(_auth_cache_key(email))
+    if row is not None:
+        return _row_to_user(row, db)
+    
+    user = db.query(models.User).filter(models.User.email == email).first()
+    if user is not None:
+        await cache_set(_auth_cache_key(email), _user_to_row(user), AUTH_USER_CACHE_TTL)
+    return user
+
+
+async def invalidate_auth_cache(email: str) -> None:
+    """Forget the cached user row for a token subject (call after the row changes)"""
+    await cache_delete(_auth_cache_key(email))
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
@@ -134,7 +178,7 @@ async def get_current_user(
             detail="Invalid token",
         )
     
-    user = db.query(models.User).filter(models.User.email == email).first()
+    user = await _get_user_by_token_subject(email, db)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -158,7 +202,6 @@ async def get_current_user_optional(
         if email is None:
             return None
         
-        user = db.query(models.User).filter(models.User.email == email).first()
-        return user
+        return await _get_user_by_token_subject(email, db)
     except JWTError:
         return None
\ No newline at end of file
@@ -0,0 +1,40 @@
+# backend/core/jobs.py
+
+import asyncio
+import dataclasses
+import logging
+from typing import Optional
+
+from arq import create_pool
+from arq.connections import ArqRedis, RedisSettings
+from redis.exceptions import RedisError
+
+from core.config import REDIS_URL
+
+logger = logging.getLogger(__name__)
+
+# Used by worker.py; the worker may wait for Redis on startup
+REDIS_SETTINGS = RedisSettings.from_dsn(REDIS_URL) if REDIS_URL else None
+
+# The API side must not stall a request retrying a dead Redis
+_ENQUEUE_SETTINGS = dataclasses.replace(REDIS_SETTINGS, conn_retries=0) if REDIS_SETTINGS else None
+
+_pool: Optional[ArqRedis] = None
+
+
+async def enqueue_job(function: str, *args) -> Optional[str]:
+    """
+    Queue function(*args) for the arq worker and return the job id.
+    Returns None when Redis is unavailable, so the caller can run the job itself.
+    """
+    global _pool
+    if _ENQUEUE_SETTINGS is None:
+        return None
+    try:
+        if _pool is None:
+            _pool = await create_pool(_ENQUEUE_SETTINGS)
+        job = await _pool.enqueue_job(function, *args)
+    except (RedisError, OSError, asyncio.TimeoutError) as exc:
+        logger.warning("Enqueue of %s failed: %s", function, exc)
+        return None
+    return job.job_id if job else None
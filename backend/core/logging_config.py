@@ -0,0 +1,33 @@
+# backend/core/logging_config.py
+
+import atexit
+import logging
+import logging.handlers
+import queue
+
+from core.config import LOG_LEVEL
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+
+
+def setup_logging() -> None:
+    """
+    Route application log records through a QueueHandler.
+    Request handlers only enqueue records; a background QueueListener
+    thread does the actual (blocking) write to stderr.
+    """
+    root = logging.getLogger()
+    if any(isinstance(h, logging.handlers.QueueHandler) for h in root.handlers):
+        return
+
+    log_queue = queue.SimpleQueue()
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(LOG_LEVEL)
@@ -4,18 +4,40 @@
 # Removed: passlib.hash.bcrypt.set_backend("bcrypt")
 
 import bcrypt # <<< ADD THIS IMPORT
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
 from typing import Optional
+import logging
 from .config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
 
 # We no longer need passlib's CryptContext for bcrypt hashing if we use bcrypt directly
 # pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto") # <<< REMOVE OR COMMENT OUT THIS LINE IF YOU ONLY USE BCRYPT
 
+logger = logging.getLogger(__name__)
+
 # Define the maximum password length for bcrypt
 MAX_PASSWORD_BYTES = 72
 
+# New hashes use argon2id with the OWASP minimum parameters (19 MiB, 2 passes,
+# 1 lane): a fixed, measured cost per login instead of bcrypt's default rounds.
+# Existing bcrypt hashes still verify and are upgraded on the next login.
+argon2_hasher = PasswordHasher(memory_cost=19456, time_cost=2, parallelism=1)
+ARGON2_PREFIX = "$argon2"
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
+    if isinstance(hashed_password, bytes):
+        hashed_password = hashed_password.decode('utf-8')
+    
+    if hashed_password.startswith(ARGON2_PREFIX):
+        try:
+            return argon2_hasher.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
+    
+    # Legacy bcrypt hash
     # Ensure plain_password and hashed_password are bytes
     # Truncate the plain password before verification if it exceeds the bcrypt limit
     truncated_plain_password_bytes = plain_password.encode('utf-8')[:MAX_PASSWORD_BYTES]
@@ -31,20 +53,20 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return bcrypt.checkpw(truncated_plain_password_bytes, hashed_password_bytes)
     except ValueError as e:
         # Catch potential errors from bcrypt (e.g., invalid salt in hash)
-        print(f"Error during bcrypt.checkpw: {e}")
+        logger.warning("bcrypt.checkpw failed: %s", e)
         return False
 
 
 def get_password_hash(password: str) -> str:
-    # Truncate the password before hashing if it exceeds the bcrypt limit
-    truncated_password_bytes = password.encode('utf-8')[:MAX_PASSWORD_BYTES]
-    
-    # Generate a salt and hash the password using bcrypt directly
-    salt = bcrypt.gensalt()
-    hashed_password_bytes = bcrypt.hashpw(truncated_password_bytes, salt)
-    
-    # Return the hash as a UTF-8 string (to store in DB)
-    return hashed_password_bytes.decode('utf-8')
+    # argon2id hash as a string (to store in DB); no 72-byte limit as with bcrypt
+    return argon2_hasher.hash(password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True for legacy bcrypt hashes and argon2 hashes made with other parameters"""
+    if not hashed_password.startswith(ARGON2_PREFIX):
+        return True
+    return argon2_hasher.check_needs_rehash(hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
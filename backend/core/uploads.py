@@ -0,0 +1,110 @@
+# backend/core/uploads.py
+
+import hashlib
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+import aiofiles
+from fastapi import HTTPException, UploadFile
+from fastapi.staticfiles import StaticFiles
+
+from core.config import UPLOAD_CHUNK_SIZE, UPLOADS_MAX_AGE
+
+
+async def save_upload(upload: UploadFile, file_path: Path, max_size: Optional[int] = None, hasher=None) -> int:
+    """
+    Stream an upload to disk in chunks without blocking the event loop.
+    If max_size is given, the partial file is removed and a 400 raised
+    as soon as it is exceeded. If hasher is given (a hashlib object) it is
+    fed every chunk. Returns the number of bytes written.
+    """
+    total = 0
+    try:
+        async with aiofiles.open(file_path, "wb") as out:
+            while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+                total += len(chunk)
+                if max_size is not None and total > max_size:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"File too large (>{max_size // (1024 * 1024)} MB)"
+                    )
+                if hasher is not None:
+                    hasher.update(chunk)
+                await out.write(chunk)
+    except HTTPException:
+        file_path.unlink(missing_ok=True)
+        raise
+    return total
+
+
+async def save_upload_content_addressed(
+    upload: UploadFile, dest_dir: Path, extension: str, max_size: Optional[int] = None
+) -> str:
+    """
+    Store an upload under dest_dir as <aa>/<digest>.<extension>, where digest is
+    the BLAKE2b-256 of its content, so identical uploads share one file on disk.
+    Returns the stored path relative to dest_dir, e.g. "3f/3fa9...c1.jpg".
+    Files may be shared between rows, so request handlers never delete them;
+    unreferenced ones are removed by collect_unreferenced_uploads.
+    """
+    extension = "".join(c for c in extension.lower() if c.isalnum()) or "bin"
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = dest_dir / f".{uuid.uuid4().hex}.part"
+
+    digest = hashlib.blake2b(digest_size=32)
+    try:
+        await save_upload(upload, tmp_path, max_size, hasher=digest)
+        name = digest.hexdigest()
+        relative = Path(name[:2]) / f"{name}.{extension}"
+        target = dest_dir / relative
+        if target.exists():
+            tmp_path.unlink()
+            # Refresh the mtime: the offline GC only removes files older than
+            # UPLOAD_GC_MIN_AGE, so a file just re-uploaded is never collected
+            # before the row pointing at it is committed
+            os.utime(target)
+        else:
+            target.parent.mkdir(exist_ok=True)
+            os.replace(tmp_path, target)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return relative.as_posix()
+
+
+class UploadStaticFiles(StaticFiles):
+    """
+    StaticFiles for /uploads that lets browsers and proxies keep the files.
+    Uploads are written once and never changed in place (new content gets a
+    new name), so they are safe to cache publicly.
+    """
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = f"public, max-age={UPLOADS_MAX_AGE}"
+        return response
+
+
+def collect_unreferenced_uploads(upload_dir: Path, url_prefix: str, referenced: set, min_age: int) -> int:
+    """
+    Delete content-addressed files under upload_dir whose URL (url_prefix + relative
+    path) is not in referenced and that were not written or re-uploaded within
+    min_age seconds. Returns the number of files removed.
+    """
+    cutoff = time.time() - min_age
+    removed = 0
+    for path in upload_dir.rglob("*"):
+        if not path.is_file() or path.name.startswith("."):
+            continue
+        if f"{url_prefix}{path.relative_to(upload_dir).as_posix()}" in referenced:
+            continue
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
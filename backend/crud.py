@@ -1,9 +1,10 @@
 # backend/crud.py
+from sqlalchemy import and_, func, update
 from sqlalchemy.orm import Session
 import models, schemas
 
 # Import the password hashing/verification functions from core.security
-from core.security import get_password_hash, verify_password
+from core.security import get_password_hash, verify_password, password_needs_rehash
 
 
 def get_user_by_email(db: Session, email: str):
@@ -46,9 +47,33 @@ def authenticate_user(db: Session, email: str, password: str):
         return False
     if not verify_password(password, user.password):
         return False
+    if password_needs_rehash(user.password):
+        # Upgrade legacy bcrypt hashes now that we have the plain password
+        user.password = get_password_hash(password)
+        db.commit()
     return user
 
 
+def update_user(db: Session, user_id: int, values: dict):
+    """Update a user's columns in one UPDATE ... RETURNING; None if no such user"""
+    stmt = (
+        update(models.User)
+        .where(models.User.id == user_id)
+        .values(**values)
+        .returning(models.User)
+        .execution_options(synchronize_session=False)
+    )
+    return db.execute(stmt).scalar_one_or_none()
+
+
 def get_users(db: Session, skip: int = 0, limit: int = 10):
     """Get list of users with pagination"""
-    return db.query(models.User).offset(skip).limit(limit).all()
\ No newline at end of file
+    return db.query(models.User).offset(skip).limit(limit).all()
+
+
+def connection_pair_filter(user_a: int, user_b: int):
+    """Match the connections row between two users, whoever initiated it"""
+    return and_(
+        func.least(models.connections.c.user_id, models.connections.c.connected_user_id) == min(user_a, user_b),
+        func.greatest(models.connections.c.user_id, models.connections.c.connected_user_id) == max(user_a, user_b)
+    )
@@ -1,11 +1,15 @@
 # backend/main.py
-from fastapi import FastAPI, Depends, HTTPException, status, Request
+from fastapi import FastAPI, Depends, HTTPException, status, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse, Response, StreamingResponse
+from jinja2 import Environment, FileSystemLoader, select_autoescape
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import select, text, func
+from sqlalchemy.exc import SQLAlchemyError
+from contextlib import asynccontextmanager
 from datetime import datetime
+from typing import Optional
+import hashlib
 import traceback
 import os
 
@@ -13,10 +17,18 @@ import os
 import models
 import schemas
 import crud
-from database import get_db, engine
+from database import get_db, engine, warm_pools, AsyncSessionLocal
 
 # Import core components
-from core.config import UPLOAD_DIR
+from core.cache import cache_get, cache_set
+from core.config import BASE_DIR, UPLOAD_DIR, MAX_ASSESSMENT_VIDEO_SIZE, ADMIN_CACHE_TTL, ADMIN_DASHBOARD_MAX_AGE
+from core.config import ADMIN_STALE_TTL
+from core.config import GZIP_MINIMUM_SIZE, GZIP_COMPRESS_LEVEL, SERVE_UPLOADS
+from core.compression import MediaAwareGZipMiddleware
+from core.logging_config import setup_logging
+from core.uploads import UploadStaticFiles
+
+setup_logging()
 
 # Import API routers
 from api import auth, users, assessments, connections, posts, coaches, messaging, admin, message_ws
@@ -39,8 +51,14 @@ load_dotenv()
 #     print(traceback.format_exc()) # Print full traceback to console
 #     raise e # Re-raise the exception to clearly show it in Uvicorn logs
 
-# Create FastAPI app
-app = FastAPI(title="TalentTracker API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pay connection setup (TCP/TLS, backend fork) here rather than on the first requests
+    await warm_pools()
+    yield
+
+# Create FastAPI app; responses are serialized with orjson unless a route says otherwise
+app = FastAPI(title="TalentTracker API", version="1.0.0", default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # CORS Middleware Configuration
 app.add_middleware(
@@ -58,8 +76,27 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
-# Mount static files for uploads
-app.mount("/uploads", StaticFiles(directory=str(UPLOAD_DIR)), name="uploads")
+app.add_middleware(MediaAwareGZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_COMPRESS_LEVEL)
+
+# Reject oversized assessment uploads from the Content-Length header,
+# before the multipart body is read and spooled to disk
+@app.middleware("http")
+async def limit_assessment_upload_size(request: Request, call_next):
+    if request.method == "POST" and request.url.path == "/api/assessments/upload":
+        try:
+            content_length = int(request.headers.get("content-length", "0"))
+        except ValueError:
+            content_length = 0
+        if content_length > MAX_ASSESSMENT_VIDEO_SIZE:
+            return JSONResponse(status_code=400, content={"detail": "File too large (>100 MB)"})
+    return await call_next(request)
+
+# Mount static files for uploads. In production let the front server serve
+# UPLOAD_DIR directly (kernel sendfile, no Python in the path), e.g. for nginx:
+#   location /uploads/ { alias <UPLOAD_DIR>/; sendfile on; tcp_nopush on; expires 1d; }
+# and set SERVE_UPLOADS=0.
+if SERVE_UPLOADS:
+    app.mount("/uploads", UploadStaticFiles(directory=str(UPLOAD_DIR)), name="uploads")
 
 # Include API routers
 app.include_router(auth.router)
@@ -102,178 +139,127 @@ def health_check(db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database connection failed: {str(e)}")
 
+# Admin dashboard template, compiled once at import and streamed per request.
+# Autoescaping keeps user-supplied fields (name, location, ...) from injecting markup.
+templates_env = Environment(
+    loader=FileSystemLoader(BASE_DIR / "templates"),
+    autoescape=select_autoescape(["html"]),
+)
+ADMIN_DASHBOARD_TEMPLATE = templates_env.get_template("admin_dashboard.html")
+
 # The /admin/dashboard HTML endpoint (from your old main.py)
 # Keep this if you want a separate HTML route, otherwise remove it and rely on /api/admin/dashboard
 @app.get("/admin/dashboard", response_class=HTMLResponse)
-def old_admin_dashboard(db: Session = Depends(get_db)):
-    users = db.query(models.User).all()
-    athletes = sum(1 for user in users if user.role == 'athlete')
-    coaches = sum(1 for user in users if user.role == 'coach')
-    
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-        <head>
-            <title>TalentTracker Admin Dashboard</title>
-            <style>
-                body {{ 
-                    font-family: Arial, sans-serif; 
-                    margin: 20px; 
-                    background-color: #f5f5f5; 
-                }}
-                .container {{
-                    max-width: 1200px;
-                    margin: 0 auto;
-                }}
-                h1 {{ 
-                    color: #333; 
-                    text-align: center;
-                    margin-bottom: 10px;
-                }}
-                .stats {{
-                    display: flex;
-                    justify-content: center;
-                    gap: 20px;
-                    margin-bottom: 20px;
-                }}
-                .stat-card {{
-                    background: white;
-                    padding: 20px;
-                    border-radius: 10px;
-                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                    text-align: center;
-                }}
-                .stat-number {{
-                    font-size: 32px;
-                    font-weight: bold;
-                    color: #4CAF50;
-                }}
-                table {{ 
-                    border-collapse: collapse; 
-                    width: 100%; 
-                    background-color: white; 
-                    box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                    border-radius: 10px;
-                    overflow: hidden;
-                }}
-                th, td {{ 
-                    border: 1px solid #ddd; 
-                    padding: 12px; 
-                    text-align: left; 
-                }}
-                th {{ 
-                    background-color: #4CAF50; 
-                    color: white; 
-                    font-weight: bold;
-                }}
-                tr:nth-child(even) {{ 
-                    background-color: #f2f2f2; 
-                }}
-                tr:hover {{
-                    background-color: #e8f5e9;
-                }}
-                .athlete {{ 
-                    color: #2196F3; 
-                    font-weight: bold; 
-                }}
-                .coach {{ 
-                    color: #FF9800; 
-                    font-weight: bold; 
-                }}
-                .empty {{
-                    color: #999;
-                }}
-                .profile-img {{
-                    width: 40px;
-                    height: 40px;
-                    border-radius: 50%;
-                    object-fit: cover;
-                }}
-                .verified {{
-                    color: #4CAF50;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>ðŸ† TalentTracker Admin Dashboard</h1> 
-                
-                <div class="stats">
-                    <div class="stat-card">
-                        <div class="stat-number">{len(users)}</div>
-                        <div>Total Users</div>
-                    </div>
-                    <div class="stat-card">
-                        <div class="stat-number" style="color: #2196F3;">{athletes}</div>
-                        <div>Athletes</div>
-                    </div>
-                    <div class="stat-card">
-                        <div class="stat-number" style="color: #FF9800;">{coaches}</div>
-                        <div>Coaches</div>
-                    </div>
-                </div>
-                
-                <table>
-                    <tr>
-                        <th>ID</th>
-                        <th>Profile</th>
-                        <th>Name</th>
-                        <th>Email</th>
-                        <th>Role</th>
-                        <th>Sport/Specialization</th>
-                        <th>Age</th>
-                        <th>Location</th>
-                        <th>Phone</th>
-                        <th>Experience</th>
-                        <th>AI Score</th>
-                        <th>Verified</th>
-                    </tr>
+async def old_admin_dashboard(
+    request: Request,
+    after_id: Optional[int] = Query(None),
+    limit: int = Query(100, ge=1, le=500),
+    format: str = Query("html", pattern="^(html|json)$"),
+):
+    """
+    Users table for the admin. format=json returns the same page and counts
+    as JSON for scripts, skipping the HTML rendering entirely.
+    Responses carry a weak ETag derived from the users table's count and latest
+    change, so a refresh with nothing changed is answered with 304.
+    The handler owns its session, so the connection is back in the pool
+    before the page is cached and rendered.
     """
+    base_key = f"admin:dashboard:v2:{format}:{after_id}:{limit}"
     
-    for user in users:
-        role_class = 'athlete' if user.role == 'athlete' else 'coach'
-        sport_info = user.sport or user.specialization or '<span class="empty">Not specified</span>'
-        experience_info = f"{user.experience} years" if user.experience else '<span class="empty">-</span>'
-        phone_info = user.phone or '<span class="empty">Not provided</span>'
-        age_info = f"{user.age} years" if user.age else '<span class="empty">-</span>'
-        location_info = user.location or '<span class="empty">Not specified</span>'
-        ai_score = getattr(user, 'ai_score', None)
-        ai_score_info = f"{ai_score}%" if ai_score else '<span class="empty">-</span>'
-        is_verified = getattr(user, 'is_verified', False)
-        verified_info = '<span class="verified">âœ“</span>' if is_verified else '<span class="empty">âœ—</span>'
-        
-        profile_img_html = '<span class="empty">No photo</span>'
-        if user.profile_image:
-            profile_img_html = f'<img src="{user.profile_image}" class="profile-img" alt="Profile" onerror="this.style.display=\'none\'">'
+    async with AsyncSessionLocal() as db:
+        try:
+            total, last_created, last_updated = (await db.execute(
+                select(func.count(models.User.id), func.max(models.User.created_at), func.max(models.User.updated_at))
+            )).one()
+            digest = hashlib.blake2b(
+                f"{total}-{last_created}-{last_updated}-{base_key}".encode(), digest_size=8
+            ).hexdigest()
+            etag = f'W/"{digest}"'
+        except SQLAlchemyError:
+            etag = None
+    
+        headers = {"ETag": etag, "Cache-Control": f"private, max-age={ADMIN_DASHBOARD_MAX_AGE}"} if etag else {}
+        if etag and etag in (tag.strip() for tag in request.headers.get("if-none-match", "").split(",")):
+            return Response(status_code=304, headers=headers)
+    
+        # Fresh copies are keyed by the ETag so a cached page never outlives the data it was built from
+        cache_key = f"{base_key}:{etag}"
+        cached = await cache_get(cache_key) if etag else None
+        if cached is not None:
+            return ORJSONResponse(cached, headers=headers) if format == "json" else HTMLResponse(cached, headers=headers)
+    
+        try:
+            # Keyset page of users (newest first) as plain rows of the columns the table renders;
+            # no ORM instances are built for a read-only listing
+            stmt = select(
+                models.User.id, models.User.name, models.User.email, models.User.role,
+                models.User.sport, models.User.specialization, models.User.age, models.User.location,
+                models.User.phone, models.User.experience, models.User.profile_image,
+                models.User.ai_score, models.User.is_verified
+            )
+            if after_id is not None:
+                stmt = stmt.where(models.User.id < after_id)
+            users = (await db.execute(stmt.order_by(models.User.id.desc()).limit(limit))).all()
+            next_cursor = users[-1].id if len(users) == limit else None
         
-        html_content += f"""
-                    <tr>
-                        <td>{user.id}</td>
-                        <td>{profile_img_html}</td>
-                        <td>{user.name}</td>
-                        <td>{user.email}</td>
-                        <td class="{role_class}">{user.role.upper() if user.role else 'USER'}</td>
-                        <td>{sport_info}</td>
-                        <td>{age_info}</td>
-                        <td>{location_info}</td>
-                        <td>{phone_info}</td>
-                        <td>{experience_info}</td>
-                        <td>{ai_score_info}</td>
-                        <td>{verified_info}</td>
-                    </tr>
-        """
+            # Header stats cover every user, not just this page
+            role_counts = dict((await db.execute(
+                select(models.User.role, func.count(models.User.id)).group_by(models.User.role)
+            )).all())
+            total_users = sum(role_counts.values())
+            athletes = role_counts.get('athlete', 0)
+            coaches = role_counts.get('coach', 0)
+        except SQLAlchemyError:
+            # Serve the last good page while the database is unavailable
+            stale = await cache_get(f"{base_key}:stale")
+            if stale is None:
+                raise
+            return ORJSONResponse(stale) if format == "json" else HTMLResponse(stale)
     
-    html_content += """
-                </table>
-            </div>
-        </body>
-    </html>
-    """
+    if format == "json":
+        result = {
+            "total": total_users,
+            "athletes": athletes,
+            "coaches": coaches,
+            "items": [user._asdict() for user in users],
+            "next_cursor": next_cursor,
+            "limit": limit
+        }
+        if etag:
+            await cache_set(cache_key, result, ADMIN_CACHE_TTL)
+        await cache_set(f"{base_key}:stale", result, ADMIN_STALE_TTL)
+        return ORJSONResponse(result, headers=headers)
+    
+    async def render():
+        chunks = []
+        for chunk in ADMIN_DASHBOARD_TEMPLATE.generate(
+            users=users, total_users=total_users, athletes=athletes, coaches=coaches,
+            next_cursor=next_cursor, limit=limit
+        ):
+            chunks.append(chunk)
+            yield chunk
+        page = "".join(chunks)
+        if etag:
+            await cache_set(cache_key, page, ADMIN_CACHE_TTL)
+        await cache_set(f"{base_key}:stale", page, ADMIN_STALE_TTL)
     
-    return html_content
+    return StreamingResponse(render(), media_type="text/html", headers=headers)
 
 
 # Run the application
 if __name__ == "__main__":
+    # Development entrypoint; production runs e.g.
+    #   gunicorn main:app -k uvicorn.workers.UvicornWorker -w $WEB_CONCURRENCY
+    # Each worker is a separate process: ML models are loaded
+    # per process, WebSocket fan-out goes through Redis (api/message_ws.py).
+    import sys
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    from core.config import WEB_CONCURRENCY
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=WEB_CONCURRENCY,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",  # uvloop has no Windows build
+        http="httptools",
+    )
\ No newline at end of file
@@ -0,0 +1,22 @@
+-- backend/migrations/001_connections_unique_pair.sql
+-- One connections row per unordered user pair, looked up by (LEAST, GREATEST).
+-- Rows stay directed (user_id = initiator) so pending requests keep their sender.
+
+BEGIN;
+
+-- Keep the oldest row for each pair, preferring an accepted one
+DELETE FROM connections c
+USING (
+    SELECT ctid,
+           ROW_NUMBER() OVER (
+               PARTITION BY LEAST(user_id, connected_user_id), GREATEST(user_id, connected_user_id)
+               ORDER BY (status = 'accepted') DESC, created_at ASC
+           ) AS rn
+    FROM connections
+) d
+WHERE c.ctid = d.ctid AND d.rn > 1;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_connections_pair
+    ON connections (LEAST(user_id, connected_user_id), GREATEST(user_id, connected_user_id));
+
+COMMIT;
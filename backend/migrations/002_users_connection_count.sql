@@ -0,0 +1,22 @@
+-- backend/migrations/002_users_connection_count.sql
+-- Denormalized count of accepted connections per user.
+-- Maintained by the connections_count trigger (006_connections_count_trigger.sql); this backfills existing rows.
+
+BEGIN;
+
+ALTER TABLE users ADD COLUMN IF NOT EXISTS connection_count INTEGER NOT NULL DEFAULT 0;
+
+UPDATE users u
+SET connection_count = COALESCE(c.cnt, 0)
+FROM (
+    SELECT uid, COUNT(*) AS cnt
+    FROM (
+        SELECT user_id AS uid FROM connections WHERE status = 'accepted'
+        UNION ALL
+        SELECT connected_user_id AS uid FROM connections WHERE status = 'accepted'
+    ) endpoints
+    GROUP BY uid
+) c
+WHERE c.uid = u.id;
+
+COMMIT;
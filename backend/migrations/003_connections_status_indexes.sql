@@ -0,0 +1,13 @@
+-- backend/migrations/003_connections_status_indexes.sql
+-- Covering indexes for the per-user connection lookups (both directions)
+-- and a partial index for the /api/connections/available filters.
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so no BEGIN/COMMIT here.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_conn_u_status
+    ON connections (user_id, status) INCLUDE (connected_user_id, created_at);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_conn_cu_status
+    ON connections (connected_user_id, status) INCLUDE (user_id, created_at);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_role_sport_location
+    ON users (role, sport, location) WHERE is_active;
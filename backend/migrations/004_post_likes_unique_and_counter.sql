@@ -0,0 +1,39 @@
+-- backend/migrations/004_post_likes_unique_and_counter.sql
+-- One like per (user, post), and posts.likes_count maintained by a trigger
+-- so like/unlike are a single INSERT ... ON CONFLICT / DELETE ... RETURNING.
+
+BEGIN;
+
+-- Drop duplicate likes before adding the constraint
+DELETE FROM post_likes l
+USING (
+    SELECT ctid,
+           ROW_NUMBER() OVER (PARTITION BY user_id, post_id ORDER BY created_at ASC) AS rn
+    FROM post_likes
+) d
+WHERE l.ctid = d.ctid AND d.rn > 1;
+
+ALTER TABLE post_likes
+    ADD CONSTRAINT uq_post_likes_user_post UNIQUE (user_id, post_id);
+
+CREATE OR REPLACE FUNCTION post_likes_count_trg() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE posts SET likes_count = COALESCE(likes_count, 0) + 1 WHERE id = NEW.post_id;
+        RETURN NEW;
+    END IF;
+    UPDATE posts SET likes_count = GREATEST(COALESCE(likes_count, 0) - 1, 0) WHERE id = OLD.post_id;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS post_likes_count ON post_likes;
+CREATE TRIGGER post_likes_count
+    AFTER INSERT OR DELETE ON post_likes
+    FOR EACH ROW EXECUTE FUNCTION post_likes_count_trg();
+
+-- Resync counters with the deduplicated likes
+UPDATE posts p
+SET likes_count = (SELECT COUNT(*) FROM post_likes l WHERE l.post_id = p.id);
+
+COMMIT;
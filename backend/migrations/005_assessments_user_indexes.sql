@@ -0,0 +1,14 @@
+-- backend/migrations/005_assessments_user_indexes.sql
+-- Composite indexes for the per-user assessment listing (keyset on created_at, id)
+-- and the per-type stats rollup. The stats index carries ai_score so the
+-- aggregate can run as an index-only scan.
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so no BEGIN/COMMIT here.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_assess_user_created
+    ON assessments (user_id, created_at DESC, id DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_assess_user_type
+    ON assessments (user_id, test_type) INCLUDE (ai_score);
+
+-- Check the listing plan: expect an Index Scan on ix_assess_user_created with no Sort node.
+-- EXPLAIN ANALYZE SELECT * FROM assessments WHERE user_id = 1 ORDER BY created_at DESC, id DESC LIMIT 20;
@@ -0,0 +1,37 @@
+-- backend/migrations/006_connections_count_trigger.sql
+-- users.connection_count (migrations/002) maintained by a trigger on connections,
+-- so every write path (accept, remove, admin/manual edits) keeps it in step.
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION connections_count_trg() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        IF OLD.status = 'accepted' THEN
+            UPDATE users SET connection_count = GREATEST(connection_count - 1, 0)
+            WHERE id IN (OLD.user_id, OLD.connected_user_id);
+        END IF;
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        IF NEW.status = 'accepted' THEN
+            UPDATE users SET connection_count = connection_count + 1
+            WHERE id IN (NEW.user_id, NEW.connected_user_id);
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS connections_count ON connections;
+CREATE TRIGGER connections_count
+    AFTER INSERT OR DELETE OR UPDATE OF status, user_id, connected_user_id ON connections
+    FOR EACH ROW EXECUTE FUNCTION connections_count_trg();
+
+-- Resync counters, in case app-maintained counts drifted
+UPDATE users u
+SET connection_count = (
+    SELECT COUNT(*) FROM connections c
+    WHERE c.status = 'accepted' AND u.id IN (c.user_id, c.connected_user_id)
+);
+
+COMMIT;
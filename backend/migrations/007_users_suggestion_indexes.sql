@@ -0,0 +1,11 @@
+-- backend/migrations/007_users_suggestion_indexes.sql
+-- Partial indexes for the connection suggestions' "same sport OR same location"
+-- match. Postgres combines them with a BitmapOr, so only matching active users
+-- are read and ranked instead of scanning every user.
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so no BEGIN/COMMIT here.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_sport_active
+    ON users (sport) WHERE is_active;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_location_active
+    ON users (location) WHERE is_active;
@@ -0,0 +1,6 @@
+-- backend/migrations/008_comments_post_index.sql
+-- Keyset pagination for a post's comments (newest first).
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so no BEGIN/COMMIT here.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_comments_post_created
+    ON comments (post_id, created_at DESC, id DESC);
@@ -0,0 +1,6 @@
+-- backend/migrations/009_performance_data_user_recorded_index.sql
+-- Per-user range scan for the bucketed averages in GET /api/users/performance.
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so no BEGIN/COMMIT here.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_perf_user_recorded_metric
+    ON performance_data (user_id, recorded_at, metric_type);
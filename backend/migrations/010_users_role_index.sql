@@ -0,0 +1,7 @@
+-- backend/migrations/010_users_role_index.sql
+-- Plain index on users.role for the dashboard's GROUP BY role counts and the admin role filters.
+-- ix_users_role_sport_location is partial (WHERE is_active) and cannot serve queries over every user.
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so no BEGIN/COMMIT here.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_role
+    ON users (role);
@@ -6,8 +6,13 @@ from enum import Enum
 import mediapipe as mp
 import time
 import json
+import logging
+import queue
+import threading
+from functools import lru_cache
 from pathlib import Path
-import traceback # Added for better error reporting
+
+logger = logging.getLogger(__name__)
 
 class SquatState(Enum):
     STANDING = "standing"
@@ -15,17 +20,150 @@ class SquatState(Enum):
     AT_BOTTOM = "at_bottom"
     ASCENDING = "ascending"
 
+# Corrected path: relative to ml_models/ for ml_models/squad_jump/data/benchmark.json
+BENCHMARK_PATH = Path(__file__).parent / "squad_jump" / "data" / "benchmark.json"
+
+
+@lru_cache(maxsize=None)
+def load_squat_benchmark():
+    """
+    Read the squat benchmark once per process.
+    Returns (benchmark, loaded_from_file); callers must copy the dict before changing it.
+    """
+    try:
+        if BENCHMARK_PATH.exists():
+            with open(BENCHMARK_PATH, 'r') as f:
+                benchmark = json.load(f)
+            logger.info("EnhancedSquatCounter loaded squat benchmark from %s", BENCHMARK_PATH)
+            return benchmark, True
+        else:
+            raise FileNotFoundError(f"Benchmark file not found at {BENCHMARK_PATH}")
+    except FileNotFoundError:
+        logger.warning("Squat benchmark file not found at %s. Using default values.", BENCHMARK_PATH)
+        return { # Default config if file is missing
+            "min_hip_angle_down": 80,
+            "max_hip_angle_up": 170,
+            "min_knee_angle_down": 80, # This would be ideal_knee_angle in squat_benchmark.py
+            "max_knee_angle_up": 170,  # This is for the 'up' position
+            "min_form_threshold": 160,
+            "rep_time_ideal_min": 1.5,
+            "rep_time_ideal_max": 3.0,
+        }, False
+    except Exception:
+        logger.exception("Failed to load squat benchmark for EnhancedSquatCounter")
+        return {}, False # Fallback
+
+
+# MediaPipe Pose indices of (hip, knee, ankle) for the left and right leg
+LEG_LANDMARKS = (
+    (mp.solutions.pose.PoseLandmark.LEFT_HIP, mp.solutions.pose.PoseLandmark.LEFT_KNEE, mp.solutions.pose.PoseLandmark.LEFT_ANKLE),
+    (mp.solutions.pose.PoseLandmark.RIGHT_HIP, mp.solutions.pose.PoseLandmark.RIGHT_KNEE, mp.solutions.pose.PoseLandmark.RIGHT_ANKLE),
+)
+
+
+def leg_points(landmarks):
+    """Normalized (x, y) of LEG_LANDMARKS as a (2, 3, 2) float array: [side][hip, knee, ankle][x, y]"""
+    return np.array(
+        [[(landmarks[i].x, landmarks[i].y) for i in side] for side in LEG_LANDMARKS],
+        dtype=np.float64
+    )
+
+
+def knee_angles(legs):
+    """Hip-knee-ankle angle in degrees for both legs of a leg_points() array"""
+    ba = legs[:, 0] - legs[:, 1]
+    bc = legs[:, 2] - legs[:, 1]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cosine = np.einsum('ij,ij->i', ba, bc) / (np.linalg.norm(ba, axis=1) * np.linalg.norm(bc, axis=1))
+    return np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0)))
+
+
+# Frames decoded ahead of the Pose graph by prefetch_frames
+FRAME_PREFETCH = 8
+
+
+def prefetch_frames(cap, maxsize=FRAME_PREFETCH):
+    """
+    Yield cap's frames while a background thread decodes the next ones.
+    OpenCV decoding and the MediaPipe graph both run outside the GIL,
+    so decoding frame n+1 overlaps with pose inference on frame n.
+    """
+    frames = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    done = object()
+
+    def produce():
+        try:
+            while not stop.is_set():
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                while not stop.is_set():
+                    try:
+                        frames.put(frame, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+        finally:
+            frames.put(done)
+
+    reader = threading.Thread(target=produce, name="squat-frame-reader", daemon=True)
+    reader.start()
+    try:
+        while (frame := frames.get()) is not done:
+            yield frame
+    finally:
+        # Consumer stopped early (or finished): let the reader exit, then drain
+        stop.set()
+        while reader.is_alive():
+            try:
+                frames.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        reader.join()
+
+
+def create_pose():
+    return mp.solutions.pose.Pose(
+        static_image_mode=False,
+        model_complexity=1,  # Reduced for faster processing
+        enable_segmentation=False,
+        min_detection_confidence=0.3,  # Lower threshold
+        min_tracking_confidence=0.3   # Lower threshold
+    )
+
+
+# One MediaPipe Pose graph per process, reused across videos. Graph calls are
+# not thread-safe, so analyze_squat_video holds the lock for the whole video.
+_shared_pose = None
+_shared_pose_lock = threading.Lock()
+
+
+def warm_up():
+    """Load the benchmark and build the shared Pose graph ahead of the first video"""
+    global _shared_pose
+    load_squat_benchmark()
+    with _shared_pose_lock:
+        if _shared_pose is None:
+            _shared_pose = create_pose()
+
+
+def analyze_squat_video(video_path, debug=True):
+    """Analyze a video with the shared, already-initialized Pose graph"""
+    global _shared_pose
+    with _shared_pose_lock:
+        if _shared_pose is None:
+            _shared_pose = create_pose()
+        else:
+            _shared_pose.reset()  # don't carry tracking over from the previous video
+        return EnhancedSquatCounter(debug=debug, pose=_shared_pose).analyze_video(video_path)
+
+
 class EnhancedSquatCounter:
-    def __init__(self, debug=True):
-        # MediaPipe setup
+    def __init__(self, debug=True, pose=None):
+        # MediaPipe setup (pass a shared Pose to skip building a new graph)
         self.mp_pose = mp.solutions.pose
-        self.pose = self.mp_pose.Pose(
-            static_image_mode=False,
-            model_complexity=1,  # Reduced for faster processing
-            enable_segmentation=False,
-            min_detection_confidence=0.3,  # Lower threshold
-            min_tracking_confidence=0.3   # Lower threshold
-        )
+        self.pose = pose if pose is not None else create_pose()
         
         self.debug = debug
         
@@ -69,37 +207,16 @@ class EnhancedSquatCounter:
         self.frames_processed = 0
         self.poses_detected = 0
 
-        # Load benchmark data for consistency
-        # Corrected path: relative to ml_models/ for ml_models/squad_jump/data/benchmark.json
-        benchmark_path = Path(__file__).parent / "squad_jump" / "data" / "benchmark.json"
-        try:
-            if benchmark_path.exists():
-                with open(benchmark_path, 'r') as f:
-                    self.benchmark = json.load(f)
-                print(f"INFO: EnhancedSquatCounter loaded squat benchmark from {benchmark_path}")
-                # Update thresholds from benchmark if available (use 'ideal_knee_angle' for 'down' threshold)
-                # Note: The benchmark.json has 'ideal_knee_angle' which is for the *bottom* of the squat.
-                # So, KNEE_ANGLE_THRESHOLD_DOWN should be around that ideal angle.
-                # KNEE_ANGLE_THRESHOLD_UP needs to be a higher angle (standing).
-                self.KNEE_ANGLE_THRESHOLD_DOWN = self.benchmark.get("ideal_knee_angle", self.KNEE_ANGLE_THRESHOLD_DOWN)
-                self.KNEE_ANGLE_THRESHOLD_UP = self.benchmark.get("max_knee_angle_up", 160) # Assume 160 if not in benchmark
-            else:
-                raise FileNotFoundError(f"Benchmark file not found at {benchmark_path}")
-        except FileNotFoundError:
-            print(f"WARNING: Squat benchmark file not found at {benchmark_path}. Using default values.")
-            self.benchmark = { # Default config if file is missing
-                "min_hip_angle_down": 80,
-                "max_hip_angle_up": 170,
-                "min_knee_angle_down": 80, # This would be ideal_knee_angle in squat_benchmark.py
-                "max_knee_angle_up": 170,  # This is for the 'up' position
-                "min_form_threshold": 160,
-                "rep_time_ideal_min": 1.5,
-                "rep_time_ideal_max": 3.0,
-            }
-        except Exception as e:
-            print(f"ERROR: Failed to load squat benchmark for EnhancedSquatCounter: {e}")
-            traceback.print_exc()
-            self.benchmark = {} # Fallback
+        # Load benchmark data for consistency (read once per process)
+        benchmark, loaded = load_squat_benchmark()
+        self.benchmark = dict(benchmark)
+        if loaded:
+            # Update thresholds from benchmark if available (use 'ideal_knee_angle' for 'down' threshold)
+            # Note: The benchmark.json has 'ideal_knee_angle' which is for the *bottom* of the squat.
+            # So, KNEE_ANGLE_THRESHOLD_DOWN should be around that ideal angle.
+            # KNEE_ANGLE_THRESHOLD_UP needs to be a higher angle (standing).
+            self.KNEE_ANGLE_THRESHOLD_DOWN = self.benchmark.get("ideal_knee_angle", self.KNEE_ANGLE_THRESHOLD_DOWN)
+            self.KNEE_ANGLE_THRESHOLD_UP = self.benchmark.get("max_knee_angle_up", 160) # Assume 160 if not in benchmark
 
     def calculate_angle(self, point1, point2, point3):
         """Calculate angle between three points. Returns None if points are invalid."""
@@ -137,37 +254,25 @@ class EnhancedSquatCounter:
             return self.squat_count, None
         
         self.poses_detected += 1
-        landmarks = results.pose_landmarks.landmark
-        
-        # Get key points (using LEFT side for consistency)
-        # Ensure landmarks are valid before accessing .x/.y
-        left_hip = landmarks[self.mp_pose.PoseLandmark.LEFT_HIP]
-        right_hip = landmarks[self.mp_pose.PoseLandmark.RIGHT_HIP]
-        left_knee = landmarks[self.mp_pose.PoseLandmark.LEFT_KNEE]
-        right_knee = landmarks[self.mp_pose.PoseLandmark.RIGHT_KNEE]
-        left_ankle = landmarks[self.mp_pose.PoseLandmark.LEFT_ANKLE]
-        right_ankle = landmarks[self.mp_pose.PoseLandmark.RIGHT_ANKLE]
+        # Read the six leg landmarks out of the protobuf once; the rest is array math
+        legs = leg_points(results.pose_landmarks.landmark)
         
         # Calculate hip position (average of left and right) - normalized y-coordinate
-        hip_y = (left_hip.y + right_hip.y) / 2 if left_hip and right_hip else None
-        
-        if hip_y is None: # If hip points invalid
-            return self.squat_count, None
+        hip_y = float(legs[:, 0, 1].mean())
 
         # Track min/max normalized positions
         self.lowest_hip_position_norm = min(self.lowest_hip_position_norm, hip_y)
         self.highest_hip_position_norm = max(self.highest_hip_position_norm, hip_y)
         
-        # Calculate knee angles
-        left_knee_angle = self.calculate_angle(left_hip, left_knee, left_ankle)
-        right_knee_angle = self.calculate_angle(right_hip, right_knee, right_ankle)
+        # Calculate knee angles (both legs at once)
+        left_knee_angle, right_knee_angle = knee_angles(legs)
         
-        if left_knee_angle is None or right_knee_angle is None:
+        if not (np.isfinite(left_knee_angle) and np.isfinite(right_knee_angle)):
             if self.debug and self.frames_processed % 60 == 0:
                 print(f"Frame {self.frames_processed}: Invalid knee angle calculation.")
             return self.squat_count, None
 
-        avg_knee_angle = (left_knee_angle + right_knee_angle) / 2
+        avg_knee_angle = float(left_knee_angle + right_knee_angle) / 2
         self.knee_angles_history.append(avg_knee_angle) # Store history
             
         if self.debug and self.frames_processed % 60 == 0:
@@ -286,11 +391,7 @@ class EnhancedSquatCounter:
         
         frame_count = 0
         
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
+        for frame in prefetch_frames(cap):
             timestamp = frame_count / fps if fps > 0 else frame_count
             current_squat_count, _ = self.process_frame(frame, timestamp) # We just need the count, feedback_data is internal state
             frame_count += 1
@@ -3,8 +3,31 @@
 import cv2
 import numpy as np
 import mediapipe as mp
+import threading
 from typing import Dict, Any
 
+# One MediaPipe Pose graph per process, reused across videos. Graph calls are
+# not thread-safe, so an analysis holds the lock while it uses the graph.
+_pose = None
+_pose_lock = threading.Lock()
+
+
+def _get_pose():
+    """Return the shared Pose graph, reset so tracking doesn't carry over between videos"""
+    global _pose
+    if _pose is None:
+        _pose = mp.solutions.pose.Pose(static_image_mode=False, min_detection_confidence=0.5)
+    else:
+        _pose.reset()
+    return _pose
+
+
+def warm_up():
+    """Build the shared Pose graph ahead of the first video"""
+    with _pose_lock:
+        _get_pose()
+
+
 class VerticalJumpAnalyzer:
     def analyze_video(self, video_path: str) -> Dict[str, Any]:
         """
@@ -29,7 +52,8 @@ class VerticalJumpAnalyzer:
             height_px = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
             
             positions = []
-            with mp_pose.Pose(static_image_mode=False, min_detection_confidence=0.5) as pose:
+            with _pose_lock:
+                pose = _get_pose()
                 while True:
                     ret, frame = cap.read()
                     if not ret:
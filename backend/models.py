@@ -1,5 +1,5 @@
 # backend/models.py
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Float, Table, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Float, Table, UniqueConstraint, Index
 
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -12,7 +12,8 @@ post_likes = Table(
     Base.metadata,
     Column('user_id', Integer, ForeignKey('users.id')),
     Column('post_id', Integer, ForeignKey('posts.id')),
-    Column('created_at', DateTime(timezone=True), server_default=func.now())
+    Column('created_at', DateTime(timezone=True), server_default=func.now()),
+    UniqueConstraint('user_id', 'post_id', name='uq_post_likes_user_post')
 )
 
 connections = Table(
@@ -24,6 +25,24 @@ connections = Table(
     Column('created_at', DateTime(timezone=True), server_default=func.now())
 )
 
+# One row per unordered pair; rows stay directed (user_id = initiator)
+Index(
+    'uq_connections_pair',
+    func.least(connections.c.user_id, connections.c.connected_user_id),
+    func.greatest(connections.c.user_id, connections.c.connected_user_id),
+    unique=True
+)
+Index(
+    'ix_conn_u_status',
+    connections.c.user_id, connections.c.status,
+    postgresql_include=['connected_user_id', 'created_at']
+)
+Index(
+    'ix_conn_cu_status',
+    connections.c.connected_user_id, connections.c.status,
+    postgresql_include=['user_id', 'created_at']
+)
+
 
 class User(Base):
     __tablename__ = "users"
@@ -54,6 +73,7 @@ class User(Base):
     national_rank = Column(Integer, nullable=True)
     ai_score = Column(Float, nullable=True)
     weekly_progress = Column(Float, default=0.0)
+    connection_count = Column(Integer, nullable=False, default=0, server_default='0')  # accepted connections, kept by a trigger (migrations/006)
 
     # Status
     is_active = Column(Boolean, default=True)
@@ -84,6 +104,19 @@ class User(Base):
         backref="connections_received"
     )
 
+    # Partial indexes for the /api/connections/available filters and the
+    # suggestions' sport OR location match (combined by a bitmap OR)
+    __table_args__ = (
+        Index(
+            'ix_users_role_sport_location', 'role', 'sport', 'location',
+            postgresql_where=(is_active == True)
+        ),
+        Index('ix_users_sport_active', 'sport', postgresql_where=(is_active == True)),
+        Index('ix_users_location_active', 'location', postgresql_where=(is_active == True)),
+        # Role counts (GROUP BY role) and role filters over all users, active or not
+        Index('ix_users_role', 'role'),
+    )
+
 class Conversation(Base):
     __tablename__ = "conversations"
     
@@ -149,7 +182,7 @@ class Post(Base):
     media_type = Column(String(50), nullable=True)  # image, video
 
     # Stats
-    likes_count = Column(Integer, default=0)
+    likes_count = Column(Integer, default=0)  # maintained by the post_likes_count trigger
     comments_count = Column(Integer, default=0)
     shares_count = Column(Integer, default=0)
 
@@ -181,6 +214,11 @@ class Comment(Base):
     post = relationship("Post", back_populates="comments")
     user = relationship("User", back_populates="comments")
 
+    __table_args__ = (
+        # Keyset pagination in GET /api/posts/{id}/comments: WHERE post_id = ? ORDER BY created_at DESC, id DESC
+        Index('ix_comments_post_created', 'post_id', created_at.desc(), id.desc()),
+    )
+
 
 class Announcement(Base):
     __tablename__ = "announcements"
@@ -215,6 +253,13 @@ class Assessment(Base):
     # Relationship back to User
     user = relationship("User", back_populates="assessments")
 
+    __table_args__ = (
+        # Keyset pagination in GET /api/assessments: WHERE user_id = ? ORDER BY created_at DESC, id DESC
+        Index('ix_assess_user_created', 'user_id', created_at.desc(), id.desc()),
+        # Per-type stats in GET /api/assessments/stats
+        Index('ix_assess_user_type', 'user_id', 'test_type', postgresql_include=['ai_score']),
+    )
+
 
 class PerformanceData(Base):
     __tablename__ = "performance_data"
@@ -228,3 +273,8 @@ class PerformanceData(Base):
     recorded_at = Column(DateTime(timezone=True), server_default=func.now())
 
     user = relationship("User", back_populates="performance_data")
+
+    __table_args__ = (
+        # Bucketed averages in GET /api/users/performance
+        Index('ix_perf_user_recorded_metric', 'user_id', 'recorded_at', 'metric_type'),
+    )
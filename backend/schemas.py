@@ -2,6 +2,7 @@
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
+from enum import Enum
 
 
 # ---------- USER SCHEMAS ----------
@@ -160,6 +161,15 @@ class ConversationDetailResponse(ConversationResponse):
         from_attributes = True
 
 
+# ---------- ASSESSMENTS ----------
+class TestType(str, Enum):
+    """Assessment tests with an analyzer; FastAPI rejects anything else with 422"""
+    HEIGHT_DETECTION = "height_detection"
+    SQUATS = "squats"
+    SHUTTLE_RUN = "shuttle_run"
+    VERTICAL_JUMP = "vertical_jump"
+
+
 # ---------- STATS, CONNECTIONS, ETC ----------
 class UserStats(BaseModel):
     name: str
@@ -0,0 +1,50 @@
+# backend/worker.py
+"""
+arq worker that runs assessment video analysis outside the API process.
+
+Run from the backend directory:
+    arq worker.WorkerSettings
+"""
+
+import asyncio
+import logging
+
+from arq import cron
+
+from core.config import ASSESSMENT_JOB_TIMEOUT, ASSESSMENT_WORKER_MAX_JOBS
+from core.jobs import REDIS_SETTINGS
+from core.logging_config import setup_logging
+
+setup_logging()
+
+from api import assessments, posts, users
+
+logger = logging.getLogger(__name__)
+
+
+async def startup(ctx) -> None:
+    # Keep models and MediaPipe graphs warm for the life of the worker
+    await asyncio.to_thread(assessments.warm_analyzers)
+
+
+async def process_assessment(ctx, assessment_id: int) -> None:
+    await assessments.process_assessment(assessment_id)
+
+
+async def collect_orphaned_uploads(ctx) -> None:
+    videos = await asyncio.to_thread(assessments.collect_orphaned_videos)
+    images = await asyncio.to_thread(users.collect_orphaned_profile_images)
+    media = await asyncio.to_thread(posts.collect_orphaned_post_media)
+    logger.info(
+        "Removed %d unreferenced assessment videos, %d profile images, %d post media files",
+        videos, images, media,
+    )
+
+
+class WorkerSettings:
+    functions = [process_assessment]
+    cron_jobs = [cron(collect_orphaned_uploads, hour=3, minute=30)]  # daily, off-peak
+    on_startup = startup
+    redis_settings = REDIS_SETTINGS
+    job_timeout = ASSESSMENT_JOB_TIMEOUT
+    max_jobs = ASSESSMENT_WORKER_MAX_JOBS
@@ -91,9 +91,8 @@ export default function ConnectionsScreen() {
   const [availableConnections, setAvailableConnections] = useState<Connection[]>([]);
   const [groups, setGroups] = useState<Group[]>([]);
   
-  // Pagination
-  const [currentPage, setCurrentPage] = useState(1);
-  const [totalPages, setTotalPages] = useState(1);
+  // Pagination (keyset cursor from the previous page; null when there are no more)
+  const [nextCursor, setNextCursor] = useState<number | null>(null);
 
   // Get auth token
   const getAuthToken = async () => {
@@ -170,7 +169,7 @@ const handleMessage = async (user: Connection) => {
     setPendingRequests(processedRequests);
     setGroups(groupsData.data || []);
 
-    await fetchAvailableConnections(1, true);
+    await fetchAvailableConnections(null, true);
 
   } catch (error) {
     console.error('Error fetching data:', error);
@@ -182,15 +181,15 @@ const handleMessage = async (user: Connection) => {
 };
 
   // Fetch available connections with filters
-  const fetchAvailableConnections = async (page = 1, reset = false) => {
+  const fetchAvailableConnections = async (cursor: number | null = null, reset = false) => {
   try {
     if (!reset && loadingMore) return;
     
     setLoadingMore(true);
     
     const params = new URLSearchParams({
-      page: page.toString(),
       limit: '20',
+      ...(cursor !== null && { cursor: cursor.toString() }),
       ...(selectedRole !== 'all' && { role: selectedRole }),
       ...(searchText && { search: searchText }),
     });
@@ -209,8 +208,7 @@ const handleMessage = async (user: Connection) => {
       setAvailableConnections(prev => [...prev, ...processedData]);
     }
     
-    setCurrentPage(page);
-    setTotalPages(response.pagination?.pages || 1);
+    setNextCursor(response.pagination?.next_cursor ?? null);
     
   } catch (error) {
     console.error('Error fetching available connections:', error);
@@ -322,7 +320,7 @@ const handleMessage = async (user: Connection) => {
     // Refetch when search or role filter changes
     const delayDebounce = setTimeout(() => {
       if (selectedTab === 'discover') {
-        fetchAvailableConnections(1, true);
+        fetchAvailableConnections(null, true);
       }
     }, 500);
 
@@ -567,8 +565,8 @@ const handleMessage = async (user: Connection) => {
         columnWrapperStyle={styles.discoverRow}
         contentContainerStyle={styles.discoverContent}
         onEndReached={() => {
-          if (currentPage < totalPages && !loadingMore) {
-            fetchAvailableConnections(currentPage + 1);
+          if (nextCursor !== null && !loadingMore) {
+            fetchAvailableConnections(nextCursor);
           }
         }}
         onEndReachedThreshold={0.5}
@@ -845,13 +845,38 @@ static async getRisingStars(days = 30, limit = 10) {
       if (!response.ok) {
         throw new Error(data.detail || 'Upload failed');
       }
-      return data;
+      // Analysis runs in the background; wait for the result
+      return await this.waitForAssessment(data.id, token);
     } catch (error) {
       console.error('Assessment upload error:', error);
       throw error;
     }
   }
 
+  static async waitForAssessment(assessmentId, token, intervalMs = 2000, timeoutMs = 10 * 60 * 1000) {
+    const deadline = Date.now() + timeoutMs;
+    while (Date.now() < deadline) {
+      await new Promise(resolve => setTimeout(resolve, intervalMs));
+
+      const response = await fetch(`${API_BASE_URL}/assessments/${assessmentId}/status`, {
+        headers: { 
+          'Authorization': `Bearer ${token}` 
+        },
+      });
+      const data = await response.json();
+      if (!response.ok) {
+        throw new Error(data.detail || 'Failed to get assessment status');
+      }
+      if (data.status === 'completed') {
+        return data;
+      }
+      if (data.status === 'failed') {
+        throw new Error(data.feedback || 'Assessment processing failed');
+      }
+    }
+    throw new Error('Assessment is still processing. Check back later.');
+  }
+
   static async getAssessments(testType = null) {
     try {
       const token = await AsyncStorage.getItem('authToken');